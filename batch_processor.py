@@ -25,20 +25,100 @@ from translate.translate import main as translate_main
 from verify import main as verify_main
 from groundtruth_check.GroundTruth_Check import main as groundtruth_main
 from config import translate_config
+import codecs
+import gc
 import logging
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 import openpyxl
+from lxml import html as lxml_html
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.exceptions import InvalidFileException
 from config import translate_config as conf
 
+logger = logging.getLogger("batch_processor")
+
+def configure_logging():
+    """
+    Sends log messages to stdout as plain lines. Called by the script entry point
+    and by each merge worker process, so importing this module leaves logging alone.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
+# Prefer the Rust based calamine reader when python-calamine is installed,
+# otherwise let pandas pick its default engine
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_READ_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_READ_ENGINE = None
+
+# Results workbook layout and styles, built once and shared by every row
+RESULTS_HEADERS = [
+    "Source Path", 
+    "Output Path", 
+    "Source Language", 
+    "Target Language", 
+    "Translation Status", 
+    "Verification Status",
+    "Ground Truth Status",
+    "Failed Sentences"
+]
+BOLD_FONT = Font(bold=True)
+CENTER_ALIGNMENT = Alignment(horizontal='center')
+HEADER_FILL = PatternFill(start_color="FFD9D9D9", end_color="FFD9D9D9", fill_type="solid")
+SUCCESS_FILL = PatternFill(start_color="FFC6EFCE", end_color="FFC6EFCE", fill_type="solid")
+FAILED_FILL = PatternFill(start_color="FFFFCCCC", end_color="FFFFCCCC", fill_type="solid")
+SKIPPED_FILL = PatternFill(start_color="FFFFFFCC", end_color="FFFFFFCC", fill_type="solid")
+# Errors expected when an Excel file is missing, locked, corrupt or not a workbook
+EXCEL_READ_ERRORS = (OSError, ValueError, KeyError, zipfile.BadZipFile, InvalidFileException)
+
+STATUS_FILLS = {'Success': SUCCESS_FILL, 'Failed': FAILED_FILL}
+OK_STATUSES = frozenset({'Success', 'Skipped', 'N/A'})
+
+# Folder -> set of file names already present or handed out, used to pick free output names
+_existing_filenames_cache = {}
+_ensured_dirs = set()
 
 
 def ensure_dir(dir_path):
-    """Create directory if it doesn't exist"""
-    if not os.path.exists(dir_path):
+    """Create directory if it doesn't exist, touching the filesystem once per directory"""
+    if dir_path not in _ensured_dirs:
         os.makedirs(dir_path, exist_ok=True)
+        _ensured_dirs.add(dir_path)
 
-def get_files_to_process(input_folder, extensions=['.html', '.htm', '.xml', '.xlsx', '.xls']):
+def _iter_files(folder, extensions):
+    """
+    Yield files under folder whose extension is in extensions, in the same
+    top-down order as os.walk, using os.scandir so entry types come from the
+    directory listing instead of extra stat calls.
+    
+    :param folder: Folder to walk
+    :param extensions: Set of lowercase file extensions to include
+    :return: Generator of file paths
+    """
+    subdirs = []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # Like os.walk, do not descend into symlinked directories
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.is_file():
+                    if os.path.splitext(entry.name)[1].lower() in extensions:
+                        yield entry.path
+    except OSError:
+        # os.walk silently skips unreadable or missing folders
+        return
+    for subdir in subdirs:
+        yield from _iter_files(subdir, extensions)
+
+def get_files_to_process(input_folder, extensions=('.html', '.htm', '.xml', '.xlsx', '.xls')):
 
     """
     Get list of files to process from the input folder.
@@ -47,16 +127,57 @@ def get_files_to_process(input_folder, extensions=['.html', '.htm', '.xml', '.xl
     :param extensions: List of file extensions to include
     :return: List of file paths
     """
-    files = []
-    for root, _, filenames in os.walk(input_folder):
-        for filename in filenames:
-            _, ext = os.path.splitext(filename)
-            if ext.lower() in extensions:
-                full_path = os.path.join(root, filename)
-                files.append(full_path)
-    return files
+    return list(_iter_files(input_folder, frozenset(ext.lower() for ext in extensions)))
+
+def _existing_filenames(folder):
+    """
+    Get the set of file names in folder, listing the folder only on first use.
+    Names handed out by the output filename helpers are added to the same set.
+    
+    :param folder: Output folder
+    :return: Set of file names
+    """
+    key = os.path.abspath(folder)
+    names = _existing_filenames_cache.get(key)
+    if names is None:
+        names = set(os.listdir(folder)) if os.path.isdir(folder) else set()
+        _existing_filenames_cache[key] = names
+    return names
+
+def _reserve_filename(folder, prefix, ext):
+    """
+    Picks the first free "<prefix><counter><ext>" name in folder, using a
+    2-digit counter (01, 02, etc.) to handle file name conflicts, and marks it as taken.
+    
+    :param folder: Folder the file will be written to
+    :param prefix: File name up to the counter
+    :param ext: File extension including the dot
+    :return: The reserved file name
+    """
+    existing = _existing_filenames(folder)
+    counter = 1
+    filename = f"{prefix}{counter:02d}{ext}"
+    while filename in existing:
+        counter += 1
+        filename = f"{prefix}{counter:02d}{ext}"
+    existing.add(filename)
+    return filename
 
-def get_output_filename(input_path, output_folder, target_language, is_compare_file=False, is_ground_truth_file=False):
+def get_image_folders(image_path_folder):
+    """
+    Maps folder names directly under image_path_folder to their paths, so the
+    per-file image folder lookup does not hit the filesystem for every file and language.
+    
+    :param image_path_folder: Folder holding one image folder per input file
+    :return: Dictionary of folder name -> folder path (empty if the folder can't be read)
+    """
+    try:
+        with os.scandir(image_path_folder) as it:
+            return {entry.name: entry.path for entry in it if entry.is_dir()}
+    except OSError:
+        return {}
+
+def get_output_filename(input_path, output_folder, target_language, is_compare_file=False, is_ground_truth_file=False, split_name=None):
     """
     Generate output filename with target language suffix.
     
@@ -64,40 +185,28 @@ def get_output_filename(input_path, output_folder, target_language, is_compare_f
     :param output_folder: Output folder
     :param target_language: Target language for translation
     :param is_compare_file: Whether this is a comparison file (always use .html extension)
-    :return: Output file path
+    :param is_ground_truth_file: Whether this is a ground truth result file (always use .xlsx extension)
+    :param split_name: (name, extension) of the input file name, if already split by the caller
+    :return: Output file path, plus the base output name for regular output files
     """
-    filename = os.path.basename(input_path)
-    name, ext = os.path.splitext(filename)
-    
-    # Create language suffix by removing spaces
-    lang_suffix = target_language.replace(' ', '')
+    name, ext = split_name or os.path.splitext(os.path.basename(input_path))
     
-    # Handle file name conflicts with 2-digit counter (01, 02, etc.)
-    counter = 1
-
     # For comparison files, always use .html extension
     if is_compare_file:
         ext = ".html"
     elif is_ground_truth_file:
         ext = ".xlsx"
     
-    # Generate output filename
-    output_filename = f"{name}_{lang_suffix}_{counter:02d}{ext}"
-    output_path = os.path.join(output_folder, output_filename)
+    # Create language suffix by removing spaces
+    base_name = f"{name}_{target_language.replace(' ', '')}"
+    output_path = os.path.join(output_folder, _reserve_filename(output_folder, f"{base_name}_", ext))
     
-
-    while os.path.exists(output_path):
-        output_filename = f"{name}_{lang_suffix}_{counter:02d}{ext}"
-        output_path = os.path.join(output_folder, output_filename)
-        counter += 1
-    if is_compare_file:
-        return output_path
-    if is_ground_truth_file:
+    if is_compare_file or is_ground_truth_file:
         return output_path
     
-    return output_path, f"{name}_{lang_suffix}"
+    return output_path, base_name
 
-def get_multi_language_xlsx_output(input_path, output_folder, target_languages, multi_language_code=None):
+def get_multi_language_xlsx_output(input_path, output_folder, target_languages, multi_language_code=None, split_name=None):
     """
     Generate output filename for multi-language Excel translations in a single file.
     
@@ -105,10 +214,10 @@ def get_multi_language_xlsx_output(input_path, output_folder, target_languages,
     :param output_folder: Output folder
     :param target_languages: List of target languages
     :param multi_language_code: Original multi-language code (e.g. '2L', '9L')
+    :param split_name: (name, extension) of the input file name, if already split by the caller
     :return: Output file path
     """
-    filename = os.path.basename(input_path)
-    name, ext = os.path.splitext(filename)
+    name, ext = split_name or os.path.splitext(os.path.basename(input_path))
     
     # Use the original multi-language code if provided, otherwise create a descriptive suffix
     if multi_language_code:
@@ -120,112 +229,60 @@ def get_multi_language_xlsx_output(input_path, output_folder, target_languages,
         else:
             lang_suffix = f"MultiLang_{len(target_languages)}"
     
-    # Handle file name conflicts with 2-digit counter (01, 02, etc.)
-    counter = 1
-    
-    # Generate output filename
-    output_filename = f"{name}_{lang_suffix}_{counter:02d}{ext}"
-    output_path = os.path.join(output_folder, output_filename)
-    
-    while os.path.exists(output_path):
-        counter += 1
-        output_filename = f"{name}_{lang_suffix}_{counter:02d}{ext}"
-        output_path = os.path.join(output_folder, output_filename)
-    
-    return output_path
+    return os.path.join(output_folder, _reserve_filename(output_folder, f"{name}_{lang_suffix}_", ext))
 
-def create_results_excel(results_file_path):
+def create_results_excel():
     """
-    Creates or updates the results Excel file with appropriate headers.
+    Creates a write-only results workbook with the header row already appended.
+    Rows are streamed with append_result and the workbook must be saved once
+    with wb.save() after the last result has been added.
     
-    :param results_file_path: Path to the results Excel file
-    :return: None
+    :return: Tuple of (workbook, worksheet)
     """
-    # Check if file exists
-    if not os.path.exists(results_file_path):
-        # Create a new workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Translation Results"
-          # Add headers
-        headers = [
-            "Source Path", 
-            "Output Path", 
-            "Source Language", 
-            "Target Language", 
-            "Translation Status", 
-            "Verification Status",
-            "Ground Truth Status",
-            "Failed Sentences"
-        ]
-        
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.value = header
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center')
-            cell.fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
-        
-        # Save the file
-        wb.save(results_file_path)
-        print(f"Created new results file: {results_file_path}")
-
-def add_result_to_excel(results_file_path, result_data):
-    """
-    Adds a result entry to the results Excel file.
-    
-    :param results_file_path: Path to the results Excel file
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Translation Results")
+    
+    header_cells = []
+    for header in RESULTS_HEADERS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = BOLD_FONT
+        cell.alignment = CENTER_ALIGNMENT
+        cell.fill = HEADER_FILL
+        header_cells.append(cell)
+    ws.append(header_cells)
+    return wb, ws
+
+def append_result(ws, result_data):
+    """
+    Appends a result entry to the write-only results worksheet.
+    
+    :param ws: Write-only worksheet returned by create_results_excel
     :param result_data: Dictionary containing result data
     :return: None
     """
-    # Create the file if it doesn't exist
-    if not os.path.exists(results_file_path):
-        create_results_excel(results_file_path)
-    
-    # Load the workbook
-    wb = openpyxl.load_workbook(results_file_path)
-    ws = wb.active
-    
-    # Get the next row
-    next_row = ws.max_row + 1
-    
-    # Add data
-    ws.cell(row=next_row, column=1).value = result_data.get('source_path', '')
-    ws.cell(row=next_row, column=2).value = result_data.get('output_path', '')
-    ws.cell(row=next_row, column=3).value = result_data.get('source_language', '')
-    ws.cell(row=next_row, column=4).value = result_data.get('target_language', '')
-    
-    # Translation status with color coding
-    translation_cell = ws.cell(row=next_row, column=5)
-    translation_cell.value = result_data.get('translation_status', 'Failed')
-    if translation_cell.value == 'Success':
-        translation_cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    else:
-        translation_cell.fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")    # Verification status with color coding
-    verification_cell = ws.cell(row=next_row, column=6)
-    verification_cell.value = result_data.get('verification_status', 'Failed')
-    if verification_cell.value == 'Success':
-        verification_cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    elif verification_cell.value == 'Failed':
-        verification_cell.fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-    else:  # Skipped
-        verification_cell.fill = PatternFill(start_color="FFFFCC", end_color="FFFFCC", fill_type="solid")
-    
-    # Ground Truth status with color coding
-    groundtruth_cell = ws.cell(row=next_row, column=7)
-    groundtruth_cell.value = result_data.get('groundtruth_status', 'N/A')
-    if groundtruth_cell.value == 'Success':
-        groundtruth_cell.fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    elif groundtruth_cell.value == 'Failed':
-        groundtruth_cell.fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-    else:  # N/A or skipped
-        groundtruth_cell.fill = PatternFill(start_color="FFFFCC", end_color="FFFFCC", fill_type="solid")
-    
-    # Failed sentences
-    ws.cell(row=next_row, column=8).value = result_data.get('failed_sentences', '')
-    
-    # Save the workbook
-    wb.save(results_file_path)
+    # Status cells are color coded: green for success, red for failure,
+    # yellow for anything else (skipped / N/A). A missing translation status
+    # counts as a failure.
+    translation_status = result_data.get('translation_status', 'Failed')
+    translation_cell = WriteOnlyCell(ws, value=translation_status)
+    translation_cell.fill = SUCCESS_FILL if translation_status == 'Success' else FAILED_FILL
+    
+    verification_cell = WriteOnlyCell(ws, value=result_data.get('verification_status', 'Failed'))
+    verification_cell.fill = STATUS_FILLS.get(verification_cell.value, SKIPPED_FILL)
+    
+    groundtruth_cell = WriteOnlyCell(ws, value=result_data.get('groundtruth_status', 'N/A'))
+    groundtruth_cell.fill = STATUS_FILLS.get(groundtruth_cell.value, SKIPPED_FILL)
+    
+    ws.append([
+        result_data.get('source_path', ''),
+        result_data.get('output_path', ''),
+        result_data.get('source_language', ''),
+        result_data.get('target_language', ''),
+        translation_cell,
+        verification_cell,
+        groundtruth_cell,
+        result_data.get('failed_sentences', ''),
+    ])
 
 def extract_failed_sentences(compare_file_path):
     """
@@ -238,127 +295,368 @@ def extract_failed_sentences(compare_file_path):
         return ""
     
     try:
-        from bs4 import BeautifulSoup
+        # Read the file once and try different encodings on the bytes in memory
+        with open(compare_file_path, 'rb') as file:
+            raw = file.read()
         
-        # Try different encodings
-        encodings = ['utf-8', 'utf-16', 'iso-8859-1', 'cp1252']
+        # Sniff the byte order mark instead of trial-decoding the whole file as UTF-16;
+        # without a BOM, any even-length file would "decode" as UTF-16 garbage
+        if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            encodings = ['utf-16']
+        else:
+            encodings = ['utf-8-sig', 'iso-8859-1', 'cp1252']
         content = None
         
         for encoding in encodings:
             try:
-                with open(compare_file_path, 'r', encoding=encoding) as file:
-                    content = file.read()
+                content = raw.decode(encoding)
                 break
             except UnicodeDecodeError:
                 continue
         
         if content is None:
-            print(f"Could not read comparison file with available encodings: {compare_file_path}")
+            logger.warning(f"Could not read comparison file with available encodings: {compare_file_path}")
+            return ""
+        
+        # Skip parsing when neither the issue highlight color nor an issue class is present,
+        # which is the case for most files. Checked on the decoded text so UTF-16 files work too.
+        lowered = content.lower()
+        if '#ffcccc' not in lowered and 'issue' not in lowered:
             return ""
         
-        # Parse HTML
-        soup = BeautifulSoup(content, 'html.parser')
+        # Parse HTML with lxml so the filters below run as XPath in C
+        tree = lxml_html.fromstring(content)
         
         # Look for elements with red background which typically indicate issues
-        problem_elements = soup.find_all(style=lambda s: s and 'background-color: #ffcccc' in s)
+        problem_elements = tree.xpath("//*[contains(@style, 'background-color: #ffcccc')]")
         
         if not problem_elements:
-            # Try different approach - find table rows with issues
-            problem_rows = soup.find_all('tr', class_=lambda c: c and 'issue' in c.lower() if c else False)
-            problem_elements = []
-            for row in problem_rows:
-                cells = row.find_all('td')
-                if cells and len(cells) >= 2:
-                    problem_elements.append(cells[1])  # Assuming second cell contains the translation
-        
-        failed_sentences = [elem.get_text().strip() for elem in problem_elements]
+            # Try different approach - find table rows with issues,
+            # assuming the second cell contains the translation
+            problem_elements = tree.xpath(
+                "//tr[contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'issue')]/td[2]"
+            )
+        
+        failed_sentences = [elem.text_content().strip() for elem in problem_elements]
         return "; ".join(failed_sentences)
     
     except Exception as e:
-        print(f"Error extracting failed sentences from {compare_file_path}: {str(e)}")
+        logger.error(f"Error extracting failed sentences from {compare_file_path}: {str(e)}")
         return ""
 
-def merge_xlsx_translations(original_file, translated_files, output_file):
+def _read_sheet_rows(excel_file):
+    """
+    Reads all rows of the first sheet of an Excel file as lists of cell values.
+    .xlsx files are streamed with a read-only openpyxl workbook; legacy .xls files
+    go through pandas. Empty cells are None and trailing empty rows are dropped.
+    
+    :param excel_file: Path to the Excel file
+    :return: List of rows, the first one being the header row
+    """
+    if excel_file.lower().endswith('.xls'):
+        df = pd.read_excel(excel_file, header=None, engine=EXCEL_READ_ENGINE)
+        rows = df.astype(object).where(df.notna(), None).values.tolist()
+    else:
+        wb = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+        try:
+            rows = [list(values) for values in wb.active.iter_rows(values_only=True)]
+        finally:
+            wb.close()
+    
+    while rows and all(value is None for value in rows[-1]):
+        rows.pop()
+    return rows
+
+def merge_xlsx_translations(original_file, translated_entries, output_file):
     """
     Merge multiple translated Excel files into a single file with all languages as columns
     
     :param original_file: Path to the original input Excel file
-    :param translated_files: List of translated Excel files to merge
+    :param translated_entries: List of (translated Excel file, target language) pairs to merge
     :param output_file: Path to save the merged output file
     :return: True if successful, False otherwise
     """
     try:
-        print(f"Merging {len(translated_files)} translated XLSX files into: {output_file}")
+        translated_files = [trans_file for trans_file, _ in translated_entries]
+        logger.info(f"Merging {len(translated_files)} translated XLSX files into: {output_file}")
         
         # Read the original file to get the base structure
-        original_df = pd.read_excel(original_file)
+        original_rows = _read_sheet_rows(original_file)
+        if not original_rows:
+            logger.warning(f"Original file is empty: {original_file}")
+            return False
+        row_count = len(original_rows) - 1
         
-        # Create a new dataframe starting with the original content
-        merged_df = original_df.copy()
+        # Columns of the merged sheet, starting with the original content.
+        # Blank and repeated header names are made unique the way pandas does.
+        merged_columns = {}
+        for col, column in enumerate(original_rows[0]):
+            column = f"Unnamed: {col}" if column is None else str(column)
+            unique_column, counter = column, 0
+            while unique_column in merged_columns:
+                counter += 1
+                unique_column = f"{column}.{counter}"
+            merged_columns[unique_column] = [row[col] if col < len(row) else None for row in original_rows[1:]]
         
-        # Process each translated file
-        for trans_file in translated_files:
+        # Read every translated file, several at a time since the readers
+        # spend most of their time parsing
+        def read_translated_rows(trans_file):
             try:
-                # Get the language from the filename
-                filename = os.path.basename(trans_file)
-                name_parts = os.path.splitext(filename)[0].split('_')
-                
-                # The language should be in the second-to-last part (before the counter)
-                if len(name_parts) < 3:
-                    print(f"Warning: Could not determine language from filename: {filename}")
-                    lang_name = f"Translation_{len(merged_df.columns) + 1}"
-                else:
-                    lang_name = name_parts[-2]
-                
-                # Read the translated file
-                trans_df = pd.read_excel(trans_file)
-                
-                # Check if the dataframe has at least 2 columns (source + translation)
-                if len(trans_df.columns) < 2:
-                    print(f"Warning: Translated file has insufficient columns: {trans_file}")
-                    continue
-                
-                # Get the second column (translation column)
-                trans_column = trans_df.columns[1]
-                
-                # Add this column to the merged dataframe
-                merged_df[lang_name] = trans_df[trans_column]
-                
-                print(f"Added {lang_name} translations from {trans_file}")
-                
-            except Exception as e:
-                print(f"Error processing translated file {trans_file}: {str(e)}")
-        
-        # Save the merged dataframe
-        merged_df.to_excel(output_file, index=False)
+                return _read_sheet_rows(trans_file)
+            except EXCEL_READ_ERRORS as e:
+                return e
         
-        # Apply formatting using openpyxl
-        wb = openpyxl.load_workbook(output_file)
-        ws = wb.active
+        with ThreadPoolExecutor(max_workers=min(len(translated_files), 8) or 1) as executor:
+            translated_rows = list(executor.map(read_translated_rows, translated_files))
         
-        # Format the header row
-        for col in range(1, ws.max_column + 1):
-            cell = ws.cell(row=1, column=col)
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="D9D9D9", end_color="D9D9D9", fill_type="solid")
+        # Process each translated file
+        for (trans_file, lang_name), trans_rows in zip(translated_entries, translated_rows):
+            if isinstance(trans_rows, Exception):
+                logger.error(f"Error processing translated file {trans_file}: {str(trans_rows)}")
+                continue
             
-            # Auto-fit column width based on content
-            max_length = 0
-            for row in range(1, ws.max_row + 1):
-                cell_value = ws.cell(row=row, column=col).value
-                if cell_value:
-                    max_length = max(max_length, len(str(cell_value)))
+            # Check if the file has at least 2 columns (source + translation)
+            if not trans_rows or len(trans_rows[0]) < 2:
+                logger.warning(f"Translated file has insufficient columns: {trans_file}")
+                continue
+            
+            # Add the second column (translation column) to the merged sheet,
+            # lined up with the rows of the original file
+            translations = [row[1] if len(row) > 1 else None for row in trans_rows[1:row_count + 1]]
+            translations.extend([None] * (row_count - len(translations)))
+            merged_columns[lang_name] = translations
+            
+            logger.info(f"Added {lang_name} translations from {trans_file}")
+        
+        # Stream the merged columns into a write-only workbook in a single pass.
+        # Column widths must be set before the first row is appended.
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet('Sheet1')
+        
+        header_cells = []
+        for col, (column, values) in enumerate(merged_columns.items(), 1):
+            max_length = max([len(column)] + [len(str(value)) for value in values if value is not None])
             adjusted_width = min(max(max_length + 2, 10), 80)  # Min 10, Max 80
-            ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = adjusted_width
+            ws.column_dimensions[get_column_letter(col)].width = adjusted_width
+            
+            cell = WriteOnlyCell(ws, value=column)
+            cell.font = BOLD_FONT
+            cell.fill = HEADER_FILL
+            header_cells.append(cell)
+        ws.append(header_cells)
+        
+        for row in zip(*merged_columns.values()):
+            ws.append(row)
         
         wb.save(output_file)
-        print(f"Successfully created merged Excel file: {output_file}")
+        
+        logger.info(f"Successfully created merged Excel file: {output_file}")
         return True
         
     except Exception as e:
-        print(f"Error merging Excel files: {str(e)}")
+        logger.error(f"Error merging Excel files: {str(e)}", exc_info=logger.isEnabledFor(logging.DEBUG))
         return False
 
+def process_file(
+        input_file,
+        output_file,
+        compare_file,
+        ground_truth_file_name,
+        ground_truth_result,
+        source_language,
+        current_target_language,
+        software_type,
+        source_type,
+        specific_names_xlsx,
+        image_path_folder,
+        image_folders,
+        database_path,
+        check_verification,
+        check_ground_truth,
+        ground_truth_folder_path,
+):
+    """
+    Translate, verify and ground-truth check a single input file for one target language.
+    Safe to run from worker threads: it only touches its own output files and returns
+    the result instead of writing it to the results workbook.
+    
+    :param input_file: Path to the file to translate
+    :param output_file: Path of the translated file
+    :param compare_file: Path of the verification comparison file
+    :param ground_truth_file_name: Base name of the expected ground truth Excel file
+    :param ground_truth_result: Path of the ground truth result file, or None when not checked
+    :param source_language: Source language
+    :param current_target_language: Target language for this file
+    :param software_type: Type of software being translated
+    :param source_type: Type of source file (e.g., 'UI', 'Help', etc.)
+    :param specific_names_xlsx: Path to the specific names Excel file
+    :param image_path_folder: Folder holding per-file image folders, or None
+    :param image_folders: Image folder names mapped to paths, from get_image_folders
+    :param database_path: Path to the translation database, or None
+    :param check_verification: Whether verification runs after translation
+    :param check_ground_truth: Whether the ground truth check runs after translation
+    :param ground_truth_folder_path: Folder holding custom ground truth files, or None
+    :return: Tuple of (result_data dictionary, overall success flag)
+    """
+    try:
+        logger.debug(f"Output file: {output_file}")
+        logger.debug(f"Compare file: {compare_file}")
+        logger.debug(f"Ground truth file name: {ground_truth_file_name}")
+        
+        # Get the file-specific image path folder if available
+        file_specific_image_path = False
+        if image_path_folder:
+            # Get the base filename without extension to match with image folder name
+            base_filename = os.path.basename(input_file)
+            name_without_ext, _ = os.path.splitext(base_filename)
+            
+            # Look up the image folder for this file in the prescanned folder names
+            file_specific_image_path = image_folders.get(name_without_ext, False)
+            if not file_specific_image_path:
+                logger.warning(f"Image folder for {name_without_ext} not found at {os.path.join(image_path_folder, name_without_ext)}")
+            else:
+                logger.debug(f"Found image folder for {name_without_ext} at {file_specific_image_path}")
+        
+        # Prepare result data dictionary
+        result_data = {
+            'source_path': input_file,
+            'output_path': output_file,
+            'source_language': source_language,
+            'target_language': current_target_language,
+            'translation_status': 'Failed',
+            'verification_status': 'Failed',
+            'groundtruth_status': 'N/A',
+            'failed_sentences': ''
+        }
+        
+        # Run translation
+        logger.info("Starting translation...")
+        translation_success = False
+        try:
+            translate_main(input_file, output_file, source_language, current_target_language, 
+                        specific_names_xlsx, software_type, image_path=file_specific_image_path,
+                        source_type=source_type, database_path=database_path)
+            
+            translation_success = os.path.exists(output_file)
+            result_data['translation_status'] = 'Success' if translation_success else 'Failed'
+            logger.info(f"Translation completed: {output_file}")
+            
+        except Exception as e:
+            logger.error(f"Error in translation: {str(e)}", exc_info=logger.isEnabledFor(logging.DEBUG))
+            result_data['translation_status'] = 'Failed'
+        
+        # Run verification only if translation succeeded
+        verification_success = False
+        
+        if translation_success and check_verification:
+            logger.info("Starting verification...")
+            try:
+                verify_main(
+                    input_file, 
+                    output_file, 
+                    compare_file, 
+                    specific_names_xlsx, 
+                    software_type, 
+                    source_language,  # Pass source language 
+                    current_target_language,  # Pass target language
+                    source_type=source_type,
+                    translate_refer=None, 
+                    database_path=database_path,
+                )
+
+                verification_success = os.path.exists(compare_file)
+                result_data['verification_status'] = 'Success' if verification_success else 'Failed'
+                
+                # Extract failed sentences if verification succeeded
+                if verification_success:
+                    result_data['failed_sentences'] = extract_failed_sentences(compare_file)
+                    
+                logger.info(f"Verification completed: {compare_file}")
+            except Exception as e:
+                logger.error(f"Error in verification: {str(e)}", exc_info=logger.isEnabledFor(logging.DEBUG))
+                result_data['verification_status'] = 'Failed'
+        elif translation_success and not check_verification:
+            logger.info("Verification skipped as per configuration")
+            result_data['verification_status'] = 'Skipped'
+        
+        # Run ground truth check if enabled
+        # Get custom ground truth path if provided
+        ground_truth_path = None
+        if ground_truth_folder_path is not None:
+            ground_truth_path = os.path.join(ground_truth_folder_path, f'{ground_truth_file_name}.xlsx')
+
+        # Only run ground truth check if translation succeeded and it's enabled
+        if translation_success and check_ground_truth:
+            logger.info("Starting ground truth verification...")
+            
+            try:
+                logger.debug(f"Ground truth output file: {ground_truth_result}")
+                
+                # Run ground truth verification; it reports whether the result file was written
+                groundtruth_success = bool(groundtruth_main(                                    
+                    input_file,
+                    output_file,
+                    ground_truth_result,
+                    specific_names_xlsx,
+                    software_type,
+                    source_language,
+                    current_target_language,
+                    ground_truth_path=ground_truth_path,  # Use custom path if provided, else the configured one
+                    check_ground_truth=True,
+                ))
+                
+                result_data['groundtruth_status'] = 'Success' if groundtruth_success else 'Failed'
+                logger.info(f"Ground truth verification completed: {ground_truth_result}")
+                
+            except Exception as e:
+                logger.error(f"Error in ground truth verification: {str(e)}", exc_info=logger.isEnabledFor(logging.DEBUG))
+                result_data['groundtruth_status'] = 'Failed'
+        else:
+            result_data['groundtruth_status'] = 'Skipped'
+        
+        # Track overall success: verification and ground truth count as a success
+        # if they succeeded or were skipped/not applicable
+        process_success = (
+            translation_success
+            and result_data['verification_status'] in OK_STATUSES
+            and result_data['groundtruth_status'] in OK_STATUSES
+        )
+        return result_data, process_success
+    except Exception as e:
+        logger.error(f"Error processing file {input_file}: {str(e)}", exc_info=logger.isEnabledFor(logging.DEBUG))
+        
+        # Report a failed result
+        result_data = {
+            'source_path': input_file,
+            'output_path': output_file,
+            'source_language': source_language,
+            'target_language': current_target_language,
+            'translation_status': 'Failed',
+            'verification_status': 'Failed',
+            'groundtruth_status': 'Failed',
+            'failed_sentences': str(e)
+        }
+        return result_data, False
+
+def read_batch_rows(batch_excel_path):
+    """
+    Reads the configuration rows of the batch Excel file without building a DataFrame.
+    Rows come from _read_sheet_rows, so .xlsx files are streamed read-only and legacy
+    .xls files still go through pandas. Empty cells are None and fully empty rows are skipped.
+    
+    :param batch_excel_path: Path to the batch Excel file
+    :return: Tuple of (list of column names, list of row dictionaries)
+    """
+    sheet_rows = _read_sheet_rows(batch_excel_path)
+    header = sheet_rows[0] if sheet_rows else ()
+    columns = [str(column) if column is not None else None for column in header]
+    rows = [
+        dict(zip(columns, values))
+        for values in sheet_rows[1:]
+        if any(value is not None for value in values)
+    ]
+    return columns, rows
+
 def process_batch_file(batch_excel_path):
     """
     Process a batch Excel file with translation configurations.
@@ -366,15 +664,22 @@ def process_batch_file(batch_excel_path):
     :param batch_excel_path: Path to the batch Excel file
     :return: Dictionary with results (success and error counts)
     """
-    print(f"Starting batch processing using: {batch_excel_path}")
+    logger.info(f"Starting batch processing using: {batch_excel_path}")
     
     if not os.path.exists(batch_excel_path):
-        print(f"Batch Excel file not found: {batch_excel_path}")
+        logger.warning(f"Batch Excel file not found: {batch_excel_path}")
         return {"success": 0, "error": 0}
     
+    # The modules, clients and config loaded so far live for the whole batch: move them
+    # out of the collector's view and collect less often, since every file allocates
+    # many short-lived objects. Cyclic garbage (e.g. parsed HTML trees) is still collected.
+    gc_threshold = gc.get_threshold()
+    gc.freeze()
+    gc.set_threshold(max(gc_threshold[0], 50000), *gc_threshold[1:])
+    
     try:
         # Read batch Excel file
-        df = pd.read_excel(batch_excel_path)
+        columns, rows = read_batch_rows(batch_excel_path)
         
         # Check if required columns exist
         required_columns = [
@@ -388,18 +693,29 @@ def process_batch_file(batch_excel_path):
         ]        # Optional column
         optional_columns = ['SPECIFIC_NAMES_XLSX_PATH', 'IMAGE_PATH_FOLDER', 'CHECK_VERIFICATION', 'CHECK_GROUND_TRUTH', 'GROUND_TRUTH_PATH', 'DATABASE_PATH']
         
-        missing_cols = [col for col in required_columns if col not in df.columns]
+        missing_cols = [col for col in required_columns if col not in columns]
         if missing_cols:
-            print(f"Missing required columns in batch Excel: {', '.join(missing_cols)}")
+            logger.warning(f"Missing required columns in batch Excel: {', '.join(missing_cols)}")
             return {"success": 0, "error": 1}
         
         success_count = 0
         error_count = 0
         results_files = []
         
+        # Resolve per-batch constants once instead of on every row
+        multi_language_options = conf.MULTI_LANGUAGE_OPTIONS
+        has_specific_names = 'SPECIFIC_NAMES_XLSX_PATH' in columns
+        has_image_path = 'IMAGE_PATH_FOLDER' in columns
+        has_database_path = 'DATABASE_PATH' in columns
+        has_check_verification = 'CHECK_VERIFICATION' in columns
+        has_check_ground_truth = 'CHECK_GROUND_TRUTH' in columns
+        has_ground_truth_path = 'GROUND_TRUTH_PATH' in columns
+        batch_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        max_workers = max(1, int(getattr(conf, 'BATCH_MAX_WORKERS', 1) or 1))
+        
         # Process each row in the Excel file
-        for index, row in df.iterrows():
-            print(f"Processing row {index+1} of {len(df)}")
+        for index, row in enumerate(rows):
+            logger.info(f"Processing row {index+1} of {len(rows)}")
             
             # Extract configuration from the current row
             source_type = str(row['SOURCE_TYPE'])
@@ -412,317 +728,225 @@ def process_batch_file(batch_excel_path):
 
             
             # Check if this is a multi-language option
-            target_languages = [target_language]
-            is_multi_language = False
-            if target_language in conf.MULTI_LANGUAGE_OPTIONS:
-                print(f"Multi-language option '{target_language}' detected. Will translate to {len(conf.MULTI_LANGUAGE_OPTIONS[target_language])} languages.")
-                target_languages = conf.MULTI_LANGUAGE_OPTIONS[target_language]
-                is_multi_language = True
+            target_languages = multi_language_options.get(target_language)
+            is_multi_language = target_languages is not None
+            if is_multi_language:
+                logger.info(f"Multi-language option '{target_language}' detected. Will translate to {len(target_languages)} languages.")
+            else:
+                target_languages = [target_language]
             
             # Get specific names Excel path if provided
-            specific_names_xlsx = str(row.get('SPECIFIC_NAMES_XLSX_PATH', None) if 'SPECIFIC_NAMES_XLSX_PATH' in df.columns else None)
+            specific_names_xlsx = str(row['SPECIFIC_NAMES_XLSX_PATH'] if has_specific_names else None)
             
             # Get image path folder if provided
-            image_path_folder = str(row.get('IMAGE_PATH_FOLDER', None) if 'IMAGE_PATH_FOLDER' in df.columns else None)
-            database_path = str(row.get('DATABASE_PATH', None) if 'DATABASE_PATH' in df.columns else None)
+            image_path_folder = row['IMAGE_PATH_FOLDER'] if has_image_path else None
+            database_path = row['DATABASE_PATH'] if has_database_path else None
             
-            print(f"Configuration: {source_language} -> {', '.join(target_languages)}, Software: {software_type}")
-            print(f"Source type: {source_type}")
-            print(f"Input folder: {input_folder}")
-            print(f"Output folder: {output_folder}")
-            print(f"Compare folder: {compare_folder}")
-            if image_path_folder:
-                if str(image_path_folder) == 'nan':
-                    print(f"Image path folder is nan, relocate to None")
+            logger.info(f"Configuration: {source_language} -> {', '.join(target_languages)}, Software: {software_type}")
+            logger.info(f"Source type: {source_type}")
+            logger.info(f"Input folder: {input_folder}")
+            logger.info(f"Output folder: {output_folder}")
+            logger.info(f"Compare folder: {compare_folder}")
+            if has_image_path:
+                if pd.isna(image_path_folder):
+                    logger.info("Image path folder is nan, relocate to None")
                     image_path_folder = None
-                print(f"Image path folder: {image_path_folder}")
-            if database_path:
-                if str(database_path) == 'nan':
-                    print(f"Database path folder is nan, relocate to None")
+                else:
+                    image_path_folder = str(image_path_folder)
+                logger.info(f"Image path folder: {image_path_folder}")
+            image_folders = get_image_folders(image_path_folder) if image_path_folder else {}
+            if has_database_path:
+                if pd.isna(database_path):
+                    logger.info("Database path folder is nan, relocate to None")
                     database_path = None
-                print(f"Database path folder: {database_path}")
+                else:
+                    database_path = str(database_path)
+                logger.info(f"Database path folder: {database_path}")
 
+            # Get all files to process from input folder; the same files are used for every language
+            files_to_process = get_files_to_process(input_folder)
+            if not files_to_process:
+                logger.warning(f"No files found in input folder: {input_folder}")
+                continue
+            
+            # Split each file name once for all of its output names
+            split_names = {input_file: os.path.splitext(os.path.basename(input_file)) for input_file in files_to_process}
 
             # Create output directories if they don't exist
             ensure_dir(output_folder)
             ensure_dir(compare_folder)
             
             # Create results Excel file in the output folder for this row
-            results_file = os.path.join(output_folder, f"translation_results_{source_language}_to_{target_language}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
-            create_results_excel(results_file)
+            results_file = os.path.join(output_folder, f"translation_results_{source_language}_to_{target_language}_{batch_timestamp}.xlsx")
+            if results_file in results_files:
+                # Another row of this batch already uses the same results file name
+                results_file = os.path.join(output_folder, f"translation_results_{source_language}_to_{target_language}_{batch_timestamp}_row{index+1}.xlsx")
+            results_wb, results_ws = create_results_excel()
             results_files.append(results_file)
             
+            # Check if verification is enabled for this row (default to True)
+            check_verification = True
+            if has_check_verification:
+                check_verification_value = row.get('CHECK_VERIFICATION')
+                if isinstance(check_verification_value, str) and check_verification_value.lower() == 'false':
+                    check_verification = False
+                elif isinstance(check_verification_value, bool) and not check_verification_value:
+                    check_verification = False
+            
+            # Check if ground truth verification is enabled for this row
+            check_ground_truth = False
+            if has_check_ground_truth:
+                check_ground_truth_value = row.get('CHECK_GROUND_TRUTH')
+                if isinstance(check_ground_truth_value, str) and check_ground_truth_value.lower() == 'true':
+                    check_ground_truth = True
+                elif isinstance(check_ground_truth_value, bool) and check_ground_truth_value:
+                    check_ground_truth = True
+            
+            # Get custom ground truth folder if provided
+            ground_truth_folder_path = row.get('GROUND_TRUTH_PATH') if has_ground_truth_path else None
+            
             # For tracking XLSX files translations that need merging
-            xlsx_files_to_merge = {}  # input_file -> list of translated files
+            xlsx_files_to_merge = defaultdict(list)  # input_file -> list of (translated file, target language)
             
-            # Process each target language
+            def collect_xlsx_to_merge(result_data):
+                # If this is a translated Excel file of a multi-language translation,
+                # add it to the list of files to merge later
+                input_file = result_data['source_path']
+                output_file = result_data['output_path']
+                if result_data['translation_status'] == 'Success' and input_file.lower().endswith(('.xlsx', '.xls')):
+                    xlsx_files_to_merge[input_file].append((output_file, result_data['target_language']))
+                    logger.debug(f"Added {output_file} to Excel files to be merged later")
+            
+            # Build one job per (file, target language) pair, reserving output names up front
+            # so concurrent jobs never race for the same name
+            file_jobs = []
             for current_target_language in target_languages:
-                print(f"\n--- Processing language: {current_target_language} ---")
-                
-                # Get all files to process from input folder
-                files_to_process = get_files_to_process(input_folder)
-                print(f"Found {len(files_to_process)} files to process")
+                logger.info(f"Queued {len(files_to_process)} files for {current_target_language}")
                 
-                if not files_to_process:
-                    print(f"No files found in input folder: {input_folder}")
-                    continue
-                
-                # Process each file
-                for i, input_file in enumerate(files_to_process, 1):
-                    try:
-                        print('='*100)
-                        print(f"Processing file {i} of {len(files_to_process)}: {input_file}")
-                        print('='*100)
-
-                        # Check if this is an Excel file
-                        is_excel = input_file.lower().endswith(('.xlsx', '.xls'))
-                        
-                        # Generate output and compare file paths
-                        output_file, ground_truth_file_name = get_output_filename(input_file, output_folder, current_target_language)
-                        compare_file = get_output_filename(input_file, compare_folder, f"{current_target_language}_Comparison", is_compare_file=True)
-                        
-                        print(f"Output file: {output_file}")
-                        print(f"Compare file: {compare_file}")
-                        print(f"Ground truth file name: {ground_truth_file_name}")
-                        
-                        # Get the file-specific image path folder if available
-                        file_specific_image_path = False
-                        if image_path_folder:
-                            # Get the base filename without extension to match with image folder name
-                            base_filename = os.path.basename(input_file)
-                            name_without_ext, _ = os.path.splitext(base_filename)
-                            
-                            # Construct the potential image folder path for this file
-                            file_specific_image_path = os.path.join(image_path_folder, name_without_ext)
-                            if not os.path.exists(file_specific_image_path) or not os.path.isdir(file_specific_image_path):
-                                print(f"Warning: Image folder for {name_without_ext} not found at {file_specific_image_path}")
-                                file_specific_image_path = False
-                            else:
-                                print(f"Found image folder for {name_without_ext} at {file_specific_image_path}")
-                        
-                        # Prepare result data dictionary
-                        result_data = {
-                            'source_path': input_file,
-                            'output_path': output_file,
-                            'source_language': source_language,
-                            'target_language': current_target_language,
-                            'translation_status': 'Failed',
-                            'verification_status': 'Failed',
-                            'groundtruth_status': 'N/A',
-                            'failed_sentences': ''
-                        }
-                        
-                        # Run translation
-                        print(f"Starting translation...")
-                        translation_success = False
-                        try:
-                            translate_main(input_file, output_file, source_language, current_target_language, 
-                                        specific_names_xlsx, software_type, image_path=file_specific_image_path,
-                                        source_type=source_type, database_path=database_path)
-                            
-                            translation_success = os.path.exists(output_file)
-                            result_data['translation_status'] = 'Success' if translation_success else 'Failed'
-                            print(f"Translation completed: {output_file}")
-                            
-                            # If this is an Excel file and it's part of a multi-language translation,
-                            # add it to the list of files to merge later
-                            if is_excel and is_multi_language and translation_success:
-                                if input_file not in xlsx_files_to_merge:
-                                    xlsx_files_to_merge[input_file] = []
-                                xlsx_files_to_merge[input_file].append(output_file)
-                                print(f"Added {output_file} to Excel files to be merged later")
-                            
-                        except Exception as e:
-                            print(f"Error in translation: {str(e)}")
-                            result_data['translation_status'] = 'Failed'
-                          # Run verification only if translation succeeded
-                        verification_success = False
-                        
-                        # Check if verification is enabled for this row (default to True)
-                        check_verification = True
-                        if 'CHECK_VERIFICATION' in df.columns:
-                            check_verification_value = row.get('CHECK_VERIFICATION')
-                            if isinstance(check_verification_value, str) and check_verification_value.lower() == 'false':
-                                check_verification = False
-                            elif isinstance(check_verification_value, bool) and not check_verification_value:
-                                check_verification = False
-                        
-                        if translation_success and check_verification:
-                            print(f"Starting verification...")
-                            try:
-                                verify_main(
-                                    input_file, 
-                                    output_file, 
-                                    compare_file, 
-                                    specific_names_xlsx, 
-                                    software_type, 
-                                    source_language,  # Pass source language 
-                                    current_target_language,  # Pass target language
-                                    source_type=source_type,
-                                    translate_refer=None, 
-                                    database_path=database_path,
-                                )
-
-                                verification_success = os.path.exists(compare_file)
-                                result_data['verification_status'] = 'Success' if verification_success else 'Failed'
-                                
-                                # Extract failed sentences if verification succeeded
-                                if verification_success:
-                                    result_data['failed_sentences'] = extract_failed_sentences(compare_file)
-                                    
-                                print(f"Verification completed: {compare_file}")
-                            except Exception as e:
-                                print(f"Error in verification: {str(e)}")
-                                result_data['verification_status'] = 'Failed'
-                        elif translation_success and not check_verification:
-                            print(f"Verification skipped as per configuration")
-                            result_data['verification_status'] = 'Skipped'
-                        
-                        # Run ground truth check if enabled
-                        groundtruth_success = False
-                        check_ground_truth = False
-                        
-                        # Check if ground truth verification is enabled for this row
-                        if 'CHECK_GROUND_TRUTH' in df.columns:
-                            check_ground_truth_value = row.get('CHECK_GROUND_TRUTH')
-                            if isinstance(check_ground_truth_value, str) and check_ground_truth_value.lower() == 'true':
-                                check_ground_truth = True
-                            elif isinstance(check_ground_truth_value, bool) and check_ground_truth_value:
-                                check_ground_truth = True
-                        
-                        # Get custom ground truth path if provided
-                        ground_truth_path = None
-                        if 'GROUND_TRUTH_PATH' in df.columns:
-                            ground_truth_folder_path = row.get('GROUND_TRUTH_PATH')
-                            ground_truth_path = os.path.join(ground_truth_folder_path, f'{ground_truth_file_name}.xlsx')
-
-                        # Only run ground truth check if translation succeeded and it's enabled
-                        if translation_success and check_ground_truth:
-                            print(f"Starting ground truth verification...")
-                            
-                            try:
-                                # Generate ground truth result file path
-                                ground_truth_result = get_output_filename(
-                                    input_file, 
-                                    output_folder, 
-                                    f"{current_target_language}_GroundTruth",
-                                    is_ground_truth_file=True
-                                )
-                                
-                                print(f"Ground truth output file: {ground_truth_result}")
-                                
-                                # Temporarily modify config if custom ground truth path provided
-                                original_ground_truth_path = None
-                                if ground_truth_path and hasattr(translate_config, 'GROUND_TRUTH_EXCEL_PATH'):
-                                    original_ground_truth_path = translate_config.GROUND_TRUTH_EXCEL_PATH
-                                    translate_config.GROUND_TRUTH_EXCEL_PATH = ground_truth_path
-                                
-                                # Set CHECK_GROUND_TRUTH to True temporarily if needed
-                                original_check_ground_truth = getattr(translate_config, 'CHECK_GROUND_TRUTH', False)
-                                translate_config.CHECK_GROUND_TRUTH = True
-                                
-                                # Run ground truth verification
-                                groundtruth_main(                                    
-                                    input_file,
-                                    output_file,
-                                    ground_truth_result,
-                                    specific_names_xlsx,
-                                    software_type,
-                                    source_language,
-                                    current_target_language,
-                                    ground_truth_path=ground_truth_path,  # Use custom path if provided
-                                )
-
-                                # Restore original config values
-                                translate_config.CHECK_GROUND_TRUTH = original_check_ground_truth
-                                if original_ground_truth_path is not None:
-                                    translate_config.GROUND_TRUTH_EXCEL_PATH = original_ground_truth_path
-                                
-                                groundtruth_success = os.path.exists(ground_truth_result)
-                                result_data['groundtruth_status'] = 'Success' if groundtruth_success else 'Failed'
-                                print(f"Ground truth verification completed: {ground_truth_result}")
-                                
-                            except Exception as e:
-                                print(f"Error in ground truth verification: {str(e)}")
-                                result_data['groundtruth_status'] = 'Failed'
-                        else:
-                            result_data['groundtruth_status'] = 'Skipped'
-                          # Add result to Excel file
-                        add_result_to_excel(results_file, result_data)
-                        
-                        # Track overall success/error counts
-                        process_success = translation_success
-                        # Verification is considered a success if it was done and succeeded, or if it was skipped
-                        # Ground truth is considered a success if it succeeded or was skipped/not applicable
-                        if process_success and (verification_success or result_data['verification_status'] == 'Skipped'):
-                            if (groundtruth_success or result_data['groundtruth_status'] in ['Skipped', 'N/A']):
-                                success_count += 1
-                            else:
-                                error_count += 1
-                        else:
-                            error_count += 1
-                    except Exception as e:
-                        print(f"Error processing file {input_file}: {str(e)}")
-                        
-                        # Add failed result to Excel
-                        result_data = {
-                            'source_path': input_file,
-                            'output_path': output_file if 'output_file' in locals() else '',
-                            'source_language': source_language,
-                            'target_language': current_target_language,
-                            'translation_status': 'Failed',
-                            'verification_status': 'Failed',
-                            'groundtruth_status': 'Failed',
-                            'failed_sentences': str(e)
-                        }
-                        add_result_to_excel(results_file, result_data)
-                        
-                        error_count += 1
+                for input_file in files_to_process:
+                    split_name = split_names[input_file]
+                    output_file, ground_truth_file_name = get_output_filename(input_file, output_folder, current_target_language, split_name=split_name)
+                    compare_file = get_output_filename(input_file, compare_folder, f"{current_target_language}_Comparison", is_compare_file=True, split_name=split_name)
+                    ground_truth_result = None
+                    if check_ground_truth:
+                        ground_truth_result = get_output_filename(
+                            input_file, 
+                            output_folder, 
+                            f"{current_target_language}_GroundTruth",
+                            is_ground_truth_file=True,
+                            split_name=split_name
+                        )
+                    file_jobs.append((input_file, current_target_language, output_file, compare_file, ground_truth_file_name, ground_truth_result))
+            
+            def run_file_job(i, job):
+                input_file, current_target_language, output_file, compare_file, ground_truth_file_name, ground_truth_result = job
+                logger.info('='*100)
+                logger.info(f"Processing file {i} of {len(file_jobs)} ({current_target_language}): {input_file}")
+                logger.info('='*100)
+                return process_file(
+                    input_file,
+                    output_file,
+                    compare_file,
+                    ground_truth_file_name,
+                    ground_truth_result,
+                    source_language,
+                    current_target_language,
+                    software_type,
+                    source_type,
+                    specific_names_xlsx,
+                    image_path_folder,
+                    image_folders,
+                    database_path,
+                    check_verification,
+                    check_ground_truth,
+                    ground_truth_folder_path,
+                )
+            
+            # Process the jobs of all languages together, concurrently when BATCH_MAX_WORKERS allows it.
+            # Results are collected on this thread in job order, so the results sheet has a single
+            # writer and merged workbooks keep their language order.
+            executor = None
+            if max_workers > 1 and len(file_jobs) > 1:
+                executor = ThreadPoolExecutor(max_workers=min(max_workers, len(file_jobs)))
+                file_results = executor.map(run_file_job, range(1, len(file_jobs) + 1), file_jobs)
+            else:
+                file_results = (run_file_job(i, job) for i, job in enumerate(file_jobs, 1))
+            
+            try:
+                for result_data, file_success in file_results:
+                    # Add result to Excel file
+                    append_result(results_ws, result_data)
+                    
+                    # Track overall success/error counts
+                    success_count += file_success
+                    error_count += not file_success
+                    # Single-language rows have nothing to merge
+                    if is_multi_language:
+                        collect_xlsx_to_merge(result_data)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
             
             # After processing all languages, merge the Excel files if needed
             if xlsx_files_to_merge:
-                print(f"\n--- Merging Excel files for multi-language translations ---")
+                logger.info("\n--- Merging Excel files for multi-language translations ---")
+                
+                # Generate output filenames up front with the original multi-language code.
+                # Only inputs with multiple translated files are merged.
+                merge_jobs = []
+                for input_file, translated_entries in xlsx_files_to_merge.items():
+                    if len(translated_entries) > 1:
+                        merged_output = get_multi_language_xlsx_output(input_file, output_folder, target_languages, target_language, split_name=split_names[input_file])
+                        logger.info(f"Merging translations for {os.path.basename(input_file)} into {os.path.basename(merged_output)}")
+                        merge_jobs.append((input_file, translated_entries, merged_output))
                 
-                for input_file, translated_files in xlsx_files_to_merge.items():
-                    # Only merge if we have multiple files
-                    if len(translated_files) > 1:
-                        # Generate output filename for merged file with the original multi-language code
-                        merged_output = get_multi_language_xlsx_output(input_file, output_folder, target_languages, target_language)
-                        
-                        print(f"Merging translations for {os.path.basename(input_file)} into {os.path.basename(merged_output)}")
-                        
-                        # Merge the files
-                        merge_result = merge_xlsx_translations(input_file, translated_files, merged_output)
-                          # Add result to Excel file
-                        merge_result_data = {
-                            'source_path': input_file,
-                            'output_path': merged_output,
-                            'source_language': source_language,
-                            'target_language': target_language,  # Use the original multi-language code (e.g. '2L', '9L')
-                            'translation_status': 'Success' if merge_result else 'Failed',
-                            'verification_status': 'N/A',
-                            'groundtruth_status': 'N/A',
-                            'failed_sentences': ''
-                        }
-                        add_result_to_excel(results_file, merge_result_data)
-                        
-                        if merge_result:
-                            print(f"Successfully merged Excel translations into: {merged_output}")
-                        else:
-                            print(f"Failed to merge Excel translations")
+                # Merging is CPU bound pandas/openpyxl work, so run several merges in separate processes
+                if len(merge_jobs) > 1:
+                    with ProcessPoolExecutor(max_workers=min(len(merge_jobs), os.cpu_count() or 1), initializer=configure_logging) as executor:
+                        merge_results = list(executor.map(merge_xlsx_translations, *zip(*merge_jobs)))
+                else:
+                    merge_results = [merge_xlsx_translations(*job) for job in merge_jobs]
+                
+                for (input_file, translated_entries, merged_output), merge_result in zip(merge_jobs, merge_results):
+                    # Add result to Excel file
+                    merge_result_data = {
+                        'source_path': input_file,
+                        'output_path': merged_output,
+                        'source_language': source_language,
+                        'target_language': target_language,  # Use the original multi-language code (e.g. '2L', '9L')
+                        'translation_status': 'Success' if merge_result else 'Failed',
+                        'verification_status': 'N/A',
+                        'groundtruth_status': 'N/A',
+                        'failed_sentences': ''
+                    }
+                    append_result(results_ws, merge_result_data)
+                    
+                    if merge_result:
+                        logger.info(f"Successfully merged Excel translations into: {merged_output}")
+                    else:
+                        logger.error("Failed to merge Excel translations")
             
-            print(f"Completed row {index+1} of {len(df)}")
+            # Write the results workbook once all results for this row are in
+            results_wb.save(results_file)
+            logger.info(f"Saved results file: {results_file}")
+            logger.info(f"Completed row {index+1} of {len(rows)}")
+            
+            # Release the row's garbage in one pass between rows
+            gc.collect()
         
-        print(f"Batch processing completed. Success: {success_count}, Errors: {error_count}")
-        print(f"Results saved to:")
+        logger.info(f"Batch processing completed. Success: {success_count}, Errors: {error_count}")
+        logger.info("Results saved to:")
         for results_file in results_files:
-            print(f"  - {results_file}")
+            logger.info(f"  - {results_file}")
             
         return {"success": success_count, "error": error_count, "results_files": results_files}
         
     except Exception as e:
-        print(f"Error processing batch file: {str(e)}")
+        logger.error(f"Error processing batch file: {str(e)}", exc_info=logger.isEnabledFor(logging.DEBUG))
         return {"success": 0, "error": 1}
+    finally:
+        gc.set_threshold(*gc_threshold)
+        gc.unfreeze()
 
 def main(batch_excel_path=None):
     """
@@ -734,29 +958,34 @@ def main(batch_excel_path=None):
     if not batch_excel_path:
         if hasattr(translate_config, 'BATCH_EXCEL_PATH'):
             batch_excel_path = translate_config.BATCH_EXCEL_PATH
-            print(f"Using BATCH_EXCEL_PATH from config: {batch_excel_path}")
+            logger.info(f"Using BATCH_EXCEL_PATH from config: {batch_excel_path}")
         else:
             error_msg = "No BATCH_EXCEL_PATH parameter found in translate_config.py"
-            print(error_msg)
-            print(f"ERROR: {error_msg}")
-            print("Please add BATCH_EXCEL_PATH to your translate_config.py file or provide it as an argument.")
+            logger.error(error_msg)
+            logger.info("Please add BATCH_EXCEL_PATH to your translate_config.py file or provide it as an argument.")
             return {"success": 0, "error": 1}
     
-    print(f"Starting batch processing with Excel: {batch_excel_path}")
+    logger.info(f"Starting batch processing with Excel: {batch_excel_path}")
     results = process_batch_file(batch_excel_path)
     
-    print(f"Batch processing summary:")
-    print(f"  Success: {results['success']} files")
-    print(f"  Errors: {results['error']} files")
+    logger.info("Batch processing summary:")
+    logger.info(f"  Success: {results['success']} files")
+    logger.info(f"  Errors: {results['error']} files")
     
     if 'results_files' in results:
-        print(f"  Results saved to:")
+        logger.info("  Results saved to:")
         for results_file in results['results_files']:
-            print(f"    - {results_file}")
+            logger.info(f"    - {results_file}")
     
     return results
 
 if __name__ == "__main__":
+    import multiprocessing as mp
+    
+    # Start merge workers from a fresh interpreter instead of forking this process,
+    # which already holds the LLM clients and their connection pools
+    mp.set_start_method("spawn", force=True)
+    configure_logging()
 
     # Check if BATCH_EXCEL_PATH exists in translate_config
     batch_excel_path = None
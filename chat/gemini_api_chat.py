@@ -2,24 +2,107 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
 
-import base64
+import binascii
+import functools
+import json
+import logging
 import re
+import time
 import asyncio
 import google.generativeai as genai
-from pages.rate_controller import RateController
+from google.api_core import exceptions as google_exceptions
+from pages.rate_controller import RateController, backoff_delay, retry_after
+from pages.general_functions import find_mapping_terms
 from config import gemini_api_conf as conf
-from typing import Tuple, Iterable, AsyncIterable, List, Dict, Any, Optional
+from prompts.translate_prompts import translate_sys_prompt
+from typing import Tuple, Iterable, AsyncIterable, List, Dict, Any, Optional, Union
 
 # Configure the Gemini API
 genai.configure(api_key=conf.GEMINI_API_KEY)
 
+# generation parameters rejected by generate_content_async
+ASYNC_UNSUPPORTED_PARAMS = frozenset({'top_p', 'top_k', 'max_output_tokens'})
+
+# translation wrapped by the model in a markdown code block
+CODE_BLOCK_RE = re.compile(r"```(?:\w*\n)?(.*?)```", re.DOTALL)
+
+IMAGE_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.bmp': 'image/bmp',
+    '.webp': 'image/webp',
+}
+IMAGE_EXTENSIONS = frozenset(IMAGE_MIME_TYPES)
+
+# errors worth another attempt: rate limits (ResourceExhausted is a TooManyRequests), 5xx including
+# deadline timeouts, and dropped connections; anything else fails the same way again
+TRANSIENT_ERRORS = (google_exceptions.TooManyRequests, google_exceptions.ServerError, ConnectionError, TimeoutError)
+
 rate_control = RateController(
     limit=conf.N_LIMIT,
     period_sec=conf.PERIOD_SEC,
     backoff_max_retry=conf.BACKOFF_MAX_RETRY,
-    backoff_on_errors=(Exception,)
+    backoff_on_errors=TRANSIENT_ERRORS
 )
 
+@functools.lru_cache(maxsize=32)
+def _get_model(model_name: str, system_instruction: Optional[str] = None) -> genai.GenerativeModel:
+    """
+    Returns a shared model instance for the given model name and system prompt.
+    GenerativeModel only holds the model name and default settings, so one instance
+    can serve every call instead of being rebuilt per request.
+    :param model_name: Name of the Gemini model
+    :param system_instruction: System prompt the model is bound to
+    :return: Cached GenerativeModel
+    """
+    return genai.GenerativeModel(model_name, system_instruction=system_instruction)
+
+_ENCODE_CHUNK_SIZE = 57 * 1024
+
+def _make_data_url(image_path: str, mime: str = 'image/jpeg') -> str:
+    """
+    Reads an image and returns it as a base64 data URL.
+    The file is encoded chunk by chunk into one buffer after the prefix and decoded once,
+    so the raw image is never held in memory whole next to its encoding.
+    :param image_path: Path to the image file
+    :param mime: MIME type written into the URL
+    :return: data URL string
+    """
+    buffer = bytearray(f'data:{mime};base64,'.encode('ascii'))
+    with open(image_path, 'rb') as image_file:
+        # chunks are a multiple of 3 bytes, so only the last one can carry padding
+        while chunk := image_file.read(_ENCODE_CHUNK_SIZE):
+            buffer += binascii.b2a_base64(chunk, newline=False)
+    return buffer.decode('ascii')
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_data_url(image_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Memoized _make_data_url. Every translated entry sends the same reference images,
+    so each one is encoded once; mtime and size are part of the key so an edited file is re-read.
+    """
+    mime = IMAGE_MIME_TYPES.get(os.path.splitext(image_path)[1].lower(), 'image/jpeg')
+    return _make_data_url(image_path, mime)
+
+def _generation_config(temperature: float) -> Dict[str, Any]:
+    """
+    Generation settings shared by the sync and async completion calls.
+    :param temperature: The temperature parameter for controlling randomness (0.0-1.0)
+    :return: generation_config dict
+    """
+    return {
+        'temperature': temperature,
+        'top_p': 1.0,
+        'top_k': 40,
+        'max_output_tokens': 4096,
+    }
+
+# whether generate_content_async accepts generation_config; None until the first call finds out
+_async_generation_config_supported = None
+
 # Wrap the API to apply rate control and retry logics
 @rate_control.apply(asynchronous=False)
 def chat_completion_create(*args, **kwargs):
@@ -28,12 +111,7 @@ def chat_completion_create(*args, **kwargs):
     seed = kwargs.pop('seed', None)  # Get seed parameter if provided
     
     # Create generation config
-    generation_config = {
-        'temperature': temperature,
-        'top_p': 1.0,
-        'top_k': 40,
-        'max_output_tokens': 4096,
-    }
+    generation_config = _generation_config(temperature)
     
     # Add seed to generation config if provided
     if seed is not None:
@@ -43,50 +121,41 @@ def chat_completion_create(*args, **kwargs):
     if hasattr(conf, 'SAFETY_SETTINGS'):
         kwargs['safety_settings'] = conf.SAFETY_SETTINGS
     
-    # Always create a fresh model instance to avoid session closure issues
-    model = genai.GenerativeModel(conf.GEMINI_VISION_MODEL)
+    model = kwargs.pop('model', None) or _get_model(conf.GEMINI_VISION_MODEL)
     return model.generate_content(content, generation_config=generation_config, **kwargs)
 
 @rate_control.apply(asynchronous=True)
 async def chat_completion_acreate(*args, **kwargs):
+    global _async_generation_config_supported
     content = kwargs.pop('content', '')  # Remove content from kwargs
     temperature = kwargs.pop('temperature', 0.0)  # Get temperature parameter
-    seed = kwargs.pop('seed', None)  # Get seed parameter if provided
-    
-    # Create generation config that will be used if the API supports it
-    generation_config = {
-        'temperature': temperature,
-        'top_p': 1.0,
-        'top_k': 40,
-        'max_output_tokens': 4096,
-    }
-    
-    # Add seed to generation config if provided, but only for synchronous API
-    # Async API doesn't support seed in generation_config
-    if seed is not None and False:  # Disabling seed for now since it's not supported
-        generation_config['seed'] = seed
+    kwargs.pop('seed', None)  # Async API doesn't support seed in generation_config
     
     # Configure safety settings if defined
     if hasattr(conf, 'SAFETY_SETTINGS'):
         kwargs['safety_settings'] = conf.SAFETY_SETTINGS
     
-    # Always create a fresh model instance to avoid session closure issues
-    model = genai.GenerativeModel(conf.GEMINI_VISION_MODEL)
+    model = kwargs.pop('model', None) or _get_model(conf.GEMINI_VISION_MODEL)
     
-    # Improved error handling - use existing event loop instead of creating new ones
+    if _async_generation_config_supported is False:
+        return await model.generate_content_async(content, **kwargs)
+    if _async_generation_config_supported:
+        return await model.generate_content_async(content, generation_config=_generation_config(temperature), **kwargs)
+
+    # First call: try with generation_config and remember the outcome,
+    # so later calls don't pay for a failing attempt every time
     try:
-        # First attempt with generation_config
-        try:
-            result = await model.generate_content_async(content, generation_config=generation_config, **kwargs)
-            return result
-        except Exception as config_error:
-            print(f"Warning: Could not use generation_config with async API: {config_error}")
-            # Fallback to standard call without generation parameters
-            result = await model.generate_content_async(content, **kwargs)
-            return result
-    except Exception as e:
-        print(f"Error in chat_completion_acreate: {e}")
-        raise  # Re-raise the exception to be handled by the caller
+        result = await model.generate_content_async(content, generation_config=_generation_config(temperature), **kwargs)
+    except (TypeError, ValueError) as config_error:
+        # Only a rejected generation_config is remembered; anything else (rate limits,
+        # timeouts, bad input) propagates so the rate controller can retry it
+        if 'generation_config' not in str(config_error):
+            raise
+        print(f"Warning: Could not use generation_config with async API: {config_error}")
+        _async_generation_config_supported = False
+        return await model.generate_content_async(content, **kwargs)
+    _async_generation_config_supported = True
+    return result
 
 class GeminiAPIChat:
     """
@@ -100,7 +169,8 @@ class GeminiAPIChat:
             model_name: str = conf.GEMINI_VISION_MODEL,
             system_prompt: str = conf.DEFAULT_SYS_PROMPT,
             max_retry: int = 10,
-            image_path: Optional[str] = None
+            image_path: Optional[str] = None,
+            record_history: bool = True
     ):
         """
         Initialize the chat instance.
@@ -108,11 +178,14 @@ class GeminiAPIChat:
         :param system_prompt: The system prompt to be used.
         :param max_retry: The maximum number of retry attempts for API calls.
         :param image_path: Optional path to a folder containing images for translation enhancement.
+        :param record_history: Whether to keep each turn in chat_log; one-shot chats can skip it.
         """
         self.model_name = model_name
+        self.model = _get_model(model_name, system_prompt)
         self.chat_log = []
         self.sys_prompt = system_prompt
         self.image_path = image_path
+        self.record_history = record_history
 
         self.max_retry = max_retry
         self.retry_cnt = 0
@@ -122,23 +195,38 @@ class GeminiAPIChat:
         
         :return: List of file paths to images
         """
-        if not self.image_path or not os.path.exists(self.image_path) or not os.path.isdir(self.image_path):
+        if not self.image_path or not os.path.isdir(self.image_path):
             return []
         
-        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
-        image_files = []
-        
-        for filename in os.listdir(self.image_path):
-            if any(filename.lower().endswith(ext) for ext in image_extensions):
-                file_path = os.path.join(self.image_path, filename)
-                if os.path.isfile(file_path):
-                    image_files.append(file_path)
-
-        print(f"Found {len(image_files)} image(s) in {self.image_path}")
-        print(f"Image files: {image_files}")
+        with os.scandir(self.image_path) as entries:
+            image_files = [
+                entry.path for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file()
+            ]
+
+        logging.debug("Found %d image(s) in %s", len(image_files), self.image_path)
         
         return image_files
     
+    @staticmethod
+    def _image_part(image_path: str) -> Optional[Dict[str, Any]]:
+        """Read one image into an image_url content part.
+        
+        :param image_path: Path to the image file
+        :return: Content part, or None if the image could not be read
+        """
+        try:
+            st = os.stat(image_path)
+            part = {
+                'type': 'image_url',
+                'image_url': {'url': _cached_data_url(image_path, st.st_mtime_ns, st.st_size)}
+            }
+            logging.debug("Added image: %s", image_path)
+            return part
+        except Exception as e:
+            print(f"Failed to load image {image_path}: {e}")
+            return None
+
     def _create_content_with_images(self, user_prompt: str) -> List[Dict[str, Any]]:
         """Create content with images for the API call.
         
@@ -146,95 +234,76 @@ class GeminiAPIChat:
         :return: List of content objects including text and images
         """
         content = [user_prompt]
-        image_files = self._get_image_files()
-        
-        if not image_files:
-            return content
         
         # Add images to content
-        for image_path in image_files:
-            try:
-                with open(image_path, "rb") as image_file:
-                    image_data = image_file.read()
-                    content.append({
-                        'type': 'image_url',
-                        'image_url': {'url': f'data:image/jpeg;base64,{base64.b64encode(image_data).decode("utf-8")}'}
-                    })
-                    print(f"Added image: {os.path.basename(image_path)}")
-            except Exception as e:
-                print(f"Failed to load image {image_path}: {e}")
+        for image_path in self._get_image_files():
+            part = self._image_part(image_path)
+            if part is not None:
+                content.append(part)
         
-        return content    
+        return content
+
+    async def _acreate_content_with_images(self, user_prompt: str) -> List[Dict[str, Any]]:
+        """Create content with images for the API call, reading the images concurrently.
+        
+        :param user_prompt: The text prompt from the user
+        :return: List of content objects including text and images
+        """
+        image_files = await asyncio.to_thread(self._get_image_files)
+        parts = await asyncio.gather(*(asyncio.to_thread(self._image_part, p) for p in image_files))
+        return [user_prompt] + [part for part in parts if part is not None]
+
     def _make_content(self, user_prompt, to_continue=False):
         """
-        Create content for API call, including system prompt, chat history and user message
+        Create content for API call from the user message, adding the reference images
+        on a new turn. The system prompt is not repeated here, the model carries it as its system instruction.
         """
-        # For Gemini, we need to prepend the system prompt to the first user message
-        if not self.chat_log:
-            # First interaction, include system prompt
-            if self.image_path:
-                # With images
-                content = self._create_content_with_images(f"{self.sys_prompt}\n\nUser: {user_prompt}")
-            else:
-                # Just text
-                content = [f"{self.sys_prompt}\n\nUser: {user_prompt}"]
-        else:
-            # Subsequent interactions
-            if not to_continue:
-                if self.image_path:
-                    # With images
-                    content = self._create_content_with_images(user_prompt)
-                else:
-                    # Just text
-                    content = [user_prompt]
-            else:
-                content = [user_prompt] if isinstance(user_prompt, str) else user_prompt
-        
-        return content
+        if self.chat_log and to_continue:
+            return [user_prompt] if isinstance(user_prompt, str) else user_prompt
+        if self.image_path:
+            # With images
+            return self._create_content_with_images(user_prompt)
+        # Just text
+        return [user_prompt]
+
+    async def _amake_content(self, user_prompt, to_continue=False):
+        """
+        Async counterpart of _make_content; image files are read off the event loop
+        """
+        if self.image_path and not (self.chat_log and to_continue):
+            return await self._acreate_content_with_images(user_prompt)
+        return self._make_content(user_prompt, to_continue)
 
 
     def clear(self):
         """Clear chat history"""
         self.chat_log = []
 
-    async def close(self):
-        """Explicitly close resources used by this chat instance"""
+    async def close(self, aggressive: bool = False):
+        """
+        Explicitly close resources used by this chat instance.
+        The model and its transport are shared across chats, so this only drops the history.
+        :param aggressive: Also cancel every other pending task of the running loop
+        """
         self.chat_log = []
+        if not aggressive:
+            return
         
-        # Ensure all pending tasks are completed
         try:
-            # Get the current loop
-            try:
-                loop = asyncio.get_running_loop()
-                if not loop.is_closed():
-                    # Just clear the tasks without attempting to create new ones
-                    await asyncio.sleep(0.1)
-                    
-                    # We'll only cancel tasks that are part of the current loop
-                    # and leave loop management to the caller
-                    current_task = asyncio.current_task(loop)
-                    pending_tasks = [task for task in asyncio.all_tasks(loop) 
-                                    if not task.done() and task != current_task]
-                    
-                    # Cancel pending tasks if needed
-                    if pending_tasks:
-                        print(f"Cancelling {len(pending_tasks)} pending tasks...")
-                        for task in pending_tasks:
-                            task.cancel()
-                        # Wait for cancellation to complete
-                        try:
-                            await asyncio.gather(*pending_tasks, return_exceptions=True)
-                        except:
-                            pass
-            except RuntimeError:
-                # No running loop to worry about
-                pass
+            loop = asyncio.get_running_loop()
+            current_task = asyncio.current_task(loop)
+            pending_tasks = [task for task in asyncio.all_tasks(loop)
+                             if not task.done() and task != current_task]
+            
+            # Cancel pending tasks if needed
+            if pending_tasks:
+                print(f"Cancelling {len(pending_tasks)} pending tasks...")
+                for task in pending_tasks:
+                    task.cancel()
+                # Wait for cancellation to complete
+                await asyncio.gather(*pending_tasks, return_exceptions=True)
         except Exception as e:
             print(f"Error while closing chat resources: {e}")
-            
-        # Force garbage collection to help free resources
-        import gc
-        gc.collect()
 
     def get_response(
             self,
@@ -264,18 +333,26 @@ class GeminiAPIChat:
                 if seed is not None:
                     extra_kwargs['seed'] = seed
                     
-                response = chat_completion_create(content=content, **extra_kwargs)
+                response = chat_completion_create(content=content, model=self.model, **extra_kwargs)
                 full_content = response.text
                 finish_reason = "stop"  # Gemini doesn't provide finish reason
                 
                 # Store conversation for context
-                self.chat_log.append({"role": "user", "parts": [user_prompt]})
-                self.chat_log.append({"role": "model", "parts": [full_content]})
+                if self.record_history:
+                    self.chat_log.extend(({"role": "user", "parts": [user_prompt]},
+                                          {"role": "model", "parts": [full_content]}))
                 
                 return full_content, finish_reason
-            except Exception as error:
+            except TRANSIENT_ERRORS as error:
                 retry_cnt += 1
                 print(error, f'retry: {retry_cnt} / {self.max_retry}')
+                if retry_cnt < self.max_retry:
+                    time.sleep(max(backoff_delay(retry_cnt), retry_after(error)))
+            except Exception as error:
+                # permanent errors fail the same way again, and RetryExhaustedError means
+                # the rate controller has already spent its retries on a transient one
+                print(error)
+                return '', ''
         
         print('max retry reached')
         return '', ''
@@ -300,7 +377,7 @@ class GeminiAPIChat:
         retry_cnt = 0
         while retry_cnt < self.max_retry:
             try:                
-                content = self._make_content(user_prompt, to_continue)
+                content = await self._amake_content(user_prompt, to_continue)
                 
                 # Add temperature and seed if provided
                 if temperature is not None:
@@ -309,23 +386,28 @@ class GeminiAPIChat:
                     extra_kwargs['seed'] = seed
                 
                 # Remove generation parameters that aren't supported in async API
-                clean_kwargs = extra_kwargs.copy()
-                for param in ['top_p', 'top_k', 'max_output_tokens']:
-                    if param in clean_kwargs:
-                        clean_kwargs.pop(param)
+                clean_kwargs = {k: v for k, v in extra_kwargs.items() if k not in ASYNC_UNSUPPORTED_PARAMS}
                 
-                response = await chat_completion_acreate(content=content, **clean_kwargs)
+                response = await chat_completion_acreate(content=content, model=self.model, **clean_kwargs)
                 full_content = response.text
                 finish_reason = "stop"  # Gemini doesn't provide finish reason
                 
                 # Store conversation for context
-                self.chat_log.append({"role": "user", "parts": [user_prompt]})                
-                self.chat_log.append({"role": "model", "parts": [full_content]})
+                if self.record_history:
+                    self.chat_log.extend(({"role": "user", "parts": [user_prompt]},
+                                          {"role": "model", "parts": [full_content]}))
                 
                 return full_content, finish_reason
-            except Exception as error:
+            except TRANSIENT_ERRORS as error:
                 retry_cnt += 1
                 print(error, f'retry: {retry_cnt} / {self.max_retry}')
+                if retry_cnt < self.max_retry:
+                    await asyncio.sleep(max(backoff_delay(retry_cnt), retry_after(error)))
+            except Exception as error:
+                # permanent errors fail the same way again, and RetryExhaustedError means
+                # the rate controller has already spent its retries on a transient one
+                print(error)
+                return '', ''
         
         print('max retry reached')
         return '', ''
@@ -364,18 +446,19 @@ class GeminiAPIChat:
                 extra_kwargs.update(conf.MODEL_CONFIG[self.model_name])
             
             # Create a new model instance for this streaming session
-            response = chat_completion_create(content=content, **extra_kwargs)
+            response = chat_completion_create(content=content, model=self.model, **extra_kwargs)
             
-            full_content = ""
+            content_parts = []
             # Gemini handles streaming differently from OpenAI
             for chunk in response:
                 content_chunk = chunk.text or ""
-                full_content += content_chunk
+                content_parts.append(content_chunk)
                 yield content_chunk, None  # Gemini doesn't provide finish reason per chunk
             
             # After all chunks, store the full conversation
-            self.chat_log.append({"role": "user", "parts": [user_prompt]})
-            self.chat_log.append({"role": "model", "parts": [full_content]})
+            if self.record_history:
+                self.chat_log.extend(({"role": "user", "parts": [user_prompt]},
+                                      {"role": "model", "parts": [''.join(content_parts)]}))
             
         except Exception as e:
             print(f"Error in streaming response: {e}")
@@ -403,7 +486,7 @@ class GeminiAPIChat:
         while retry_count < max_retry:
             try:            
                 # Prepare content
-                content = self._make_content(user_prompt, to_continue)
+                content = await self._amake_content(user_prompt, to_continue)
                 
                 # Set stream=True
                 extra_kwargs['stream'] = True
@@ -415,36 +498,33 @@ class GeminiAPIChat:
                     extra_kwargs['seed'] = seed
                 
                 # Remove any generation config parameters that cause errors with generate_content_async
-                for param in ['top_p', 'top_k', 'max_output_tokens']:
-                    if param in extra_kwargs:
-                        extra_kwargs.pop(param)
+                extra_kwargs = {k: v for k, v in extra_kwargs.items() if k not in ASYNC_UNSUPPORTED_PARAMS}
                 
                 # Get model configuration if available, but remove any parameters
                 # that are incompatible with the async API
                 if hasattr(conf, 'MODEL_CONFIG') and self.model_name in conf.MODEL_CONFIG:
                     # For async calls, we need to exclude all generation config parameters
                     # as they're not supported by generate_content_async
-                    async_safe_kwargs = {}
-                    for key, value in conf.MODEL_CONFIG[self.model_name].items():
-                        # Only pass parameters that aren't generation config
-                        if key not in ['temperature', 'top_p', 'top_k', 'max_output_tokens']:
-                            async_safe_kwargs[key] = value
-                            
-                    extra_kwargs.update(async_safe_kwargs)
+                    # Only pass parameters that aren't generation config
+                    extra_kwargs.update({
+                        key: value for key, value in conf.MODEL_CONFIG[self.model_name].items()
+                        if key != 'temperature' and key not in ASYNC_UNSUPPORTED_PARAMS
+                    })
                 
                 # Use existing event loop for API calls
-                response = await chat_completion_acreate(content=content, **extra_kwargs)
+                response = await chat_completion_acreate(content=content, model=self.model, **extra_kwargs)
                 
-                full_content = ""
+                content_parts = []
                 # Process streaming response
                 async for chunk in response:
                     content_chunk = chunk.text or ""
-                    full_content += content_chunk
+                    content_parts.append(content_chunk)
                     yield content_chunk, None  # Gemini doesn't provide finish reason per chunk
                 
                 # After all chunks, store the full conversation
-                self.chat_log.append({"role": "user", "parts": [user_prompt]})
-                self.chat_log.append({"role": "model", "parts": [full_content]})
+                if self.record_history:
+                    self.chat_log.extend(({"role": "user", "parts": [user_prompt]},
+                                          {"role": "model", "parts": [''.join(content_parts)]}))
                 
                 # If we get here, streaming completed successfully
                 break
@@ -458,103 +538,111 @@ class GeminiAPIChat:
                     yield (f"Error: {str(e)}", "error")
                     break
                 
-                # Add a small delay before retrying
-                await asyncio.sleep(1)
+                # Back off before retrying, jittered so concurrent entries don't retry in lockstep
+                await asyncio.sleep(max(backoff_delay(retry_count), retry_after(e)))
+
+@functools.lru_cache(maxsize=64)
+def _translation_sys_prompt(source_lang, target_lang, software_type, source_type) -> str:
+    """
+    Translation system prompt, built once per language pair, software type and source type.
+    """
+    return translate_sys_prompt(source_lang, target_lang, software_type, source_type)
+
+def _translation_chat(source_lang, target_lang, software_type, source_type, image_path, model_name) -> GeminiAPIChat:
+    """
+    Create a single-turn chat with the translation system prompt.
+    """
+    return GeminiAPIChat(
+        model_name=model_name,
+        system_prompt=_translation_sys_prompt(source_lang, target_lang, software_type, source_type),
+        image_path=image_path,
+        record_history=False  # single turn, the chat is discarded afterwards
+    )
 
 async def translate_text_entry(
-        text: str, 
+        text: Union[str, dict], 
         source_lang: str, 
         target_lang: str, 
         mapping_table: dict, 
         software_type: str, 
+        source_type: str,
         image_path: Optional[str] = None,
         model_name: str = None,
         is_batch: bool = False,
         preserve_newlines: bool = True,
         temperature: float = 0.0,
-        seed: int = None
+        seed: int = None,
+        chat: Optional[GeminiAPIChat] = None
     ) -> str:
     """
     Translate a single text entry or a batch of text entries using the Gemini translation model.
     
-    :param text: Text to translate or JSON string for batch translation
+    :param text: Text to translate, or for batch translation a JSON string or a dict of the entries
     :param source_lang: Source language
     :param target_lang: Target language
     :param mapping_table: Dictionary with specific name translations
     :param software_type: Type of software being translated
+    :param source_type: Type of source file (e.g., 'UI', 'Help', etc.)
     :param image_path: Optional path to images for translation enhancement
     :param model_name: Optional model name override
     :param is_batch: Whether the input is a batch of text entries in JSON format
     :param preserve_newlines: Whether to explicitly preserve newlines in the translation
     :param temperature: The temperature parameter for controlling randomness (0.0-1.0)
     :param seed: Optional seed for deterministic generation
+    :param chat: Optional chat to reuse; it must not record history and is left open for the caller
     :return: Translated text or JSON string for batch translation
     """
     if not text or str(text).strip() == '':
         return ''
+
+    # A batch given as a dict is serialized once here, instead of the caller dumping it first
+    if is_batch and isinstance(text, dict):
+        text = json.dumps(text, ensure_ascii=False)
     
     # Get the model name from config if not specified
     if not model_name:
         model_name = conf.GEMINI_VISION_MODEL
     
     # Initialize the chat with appropriate system prompt
-    from prompts.translate_prompts import translate_sys_prompt
-    chat = GeminiAPIChat(
-        model_name=model_name,
-        system_prompt=translate_sys_prompt(source_lang, target_lang, software_type),
-        image_path=image_path
-    )
+    own_chat = chat is None
+    if own_chat:
+        chat = _translation_chat(source_lang, target_lang, software_type, source_type, image_path, model_name)
     
-    # Check if any specific names apply to this text
-    relevant_specific_names = {}
-    if mapping_table:
-        if is_batch:
-            # For batch translation, check all text entries
-            all_text = text  # text is already the JSON string
-            for source_term, target_term in mapping_table.items():
-                if source_term in all_text:
-                    relevant_specific_names[source_term] = target_term
-        else:
-            # For single text translation
-            for source_term, target_term in mapping_table.items():
-                if source_term in text:
-                    relevant_specific_names[source_term] = target_term
+    # Check if any specific names apply to this text (for batches, text is the JSON string of all entries)
+    relevant_specific_names = find_mapping_terms(mapping_table, text)
 
-    response = ''
     try:
-        # Create appropriate prompt based on whether it's batch or single
+        # Create appropriate prompt based on whether it's batch or single,
+        # collecting the pieces and joining once so the text is copied a single time
         if is_batch:
             # Batch translation prompt with emphasis on preserving newlines
-            prompt = f"""Translate the following text from {source_lang} to {target_lang}.
-"""
+            parts = [f"Translate the following text from {source_lang} to {target_lang}.\n"]
             if preserve_newlines:
-                prompt += """IMPORTANT: You MUST preserve all line breaks (\\n), bullet points, and formatting exactly as they appear in the original text.
-"""
-            prompt += f"""The input is a JSON object where each key points to a text that needs translation.
-Output the translation as a JSON object with the same keys.
-"""
+                parts.append("IMPORTANT: You MUST preserve all line breaks (\\n), bullet points, and formatting exactly as they appear in the original text.\n")
+            parts.append("The input is a JSON object where each key points to a text that needs translation.\n"
+                         "Output the translation as a JSON object with the same keys.\n")
             if preserve_newlines:
-                prompt += """Each newline character must be preserved in exactly the same position in the translated text.
-
-"""
-            prompt += text  # Add the JSON text
+                parts.append("Each newline character must be preserved in exactly the same position in the translated text.\n\n")
+            parts.append(text)  # Add the JSON text
             
         else:
             # Single text translation prompt
-            prompt = f"Please translate the following text from {source_lang} to {target_lang}:"
+            parts = [f"Please translate the following text from {source_lang} to {target_lang}:"]
             if preserve_newlines:
-                prompt += "\nIMPORTANT: You MUST preserve all line breaks (\\n) exactly as they appear in the original text."
-            prompt += f"\n\n{text}"
+                parts.append("\nIMPORTANT: You MUST preserve all line breaks (\\n) exactly as they appear in the original text.")
+            parts.append(f"\n\n{text}")
         
         # Add specific names guidance if available
         if relevant_specific_names:
-            prompt += "\n\nPlease use the following specific translations for terms:\n"
-            for source_term, target_term in relevant_specific_names.items():
-                prompt += f"- '{source_term}' → '{target_term}'\n"
+            parts.append("\n\nPlease use the following specific translations for terms:\n")
+            parts.extend(f"- '{source_term}' → '{target_term}'\n" for source_term, target_term in relevant_specific_names.items())
+        prompt = ''.join(parts)
                 
         # Get streaming response with temperature and seed
+        response_parts = []
         async for chunk, stop_reason in chat.get_stream_aresponse(prompt, temperature=temperature, seed=seed):
-            response += chunk
+            response_parts.append(chunk)
+        response = ''.join(response_parts)
             
         # For batch translations (JSON), we return the raw response to be parsed by the caller
         if is_batch:
@@ -564,17 +652,62 @@ Output the translation as a JSON object with the same keys.
         response = response.strip('"\'')
         if "```" in response:
             # If the model wraps the translation in code blocks, extract just the translation
-            match = re.search(r"```(?:\w*\n)?(.*?)```", response, re.DOTALL)
+            match = CODE_BLOCK_RE.search(response)
             if match:
                 response = match.group(1).strip()
     except Exception as e:
         print(f"Error translating text: {e}")
         return f"ERROR: {str(e)[:100]}"
     finally:
-        # Always clean up resources
-        try:
-            await chat.close()  # Use the new explicit close method
-        except Exception as close_err:
-            print(f"Error closing chat: {close_err}")
+        # Always clean up resources of a chat created here
+        if own_chat:
+            try:
+                await chat.close()  # Use the new explicit close method
+            except Exception as close_err:
+                print(f"Error closing chat: {close_err}")
         
     return response
+
+
+async def translate_many(
+        entries: List[Union[str, dict]],
+        source_lang: str,
+        target_lang: str,
+        mapping_table: dict,
+        software_type: str,
+        source_type: str,
+        concurrency: int = 8,
+        image_path: Optional[str] = None,
+        model_name: str = None,
+        **kwargs
+    ) -> List[str]:
+    """
+    Translate several entries concurrently, at most `concurrency` in flight at once.
+    The calls share one chat and still pass through the module's rate control.
+    
+    :param entries: Texts (or batches) to translate
+    :param source_lang: Source language
+    :param target_lang: Target language
+    :param mapping_table: Dictionary with specific name translations
+    :param software_type: Type of software being translated
+    :param source_type: Type of source file (e.g., 'UI', 'Help', etc.)
+    :param concurrency: Maximum number of translations awaiting the API at once
+    :param image_path: Optional path to images for translation enhancement
+    :param model_name: Optional model name override
+    :param kwargs: Other translate_text_entry arguments (is_batch, preserve_newlines, temperature, seed)
+    :return: Translations in the order of the entries
+    """
+    chat = _translation_chat(source_lang, target_lang, software_type, source_type, image_path, model_name or conf.GEMINI_VISION_MODEL)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def translate_one(entry):
+        async with semaphore:
+            return await translate_text_entry(
+                entry, source_lang, target_lang, mapping_table, software_type, source_type,
+                image_path=image_path, model_name=model_name, chat=chat, **kwargs
+            )
+
+    try:
+        return await asyncio.gather(*(translate_one(entry) for entry in entries))
+    finally:
+        await chat.close()
@@ -3,30 +3,132 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
 
 import tiktoken
-import base64
+import atexit
+import binascii
+import functools
+import json
+import logging
 import re
+import time
+import asyncio
+import weakref
+import httpx
+import openai
 from openai import OpenAI, AsyncOpenAI
 from config import openai_api_conf as conf
-from pages.rate_controller import RateController
-from typing import Tuple, Iterable, AsyncIterable, List, Dict, Any, Optional
-
-client = None
-async_client = None
+from config import translate_config
+from prompts.translate_prompts import translate_sys_prompt, translate_prompt
+from pages.rate_controller import RateController, backoff_delay, retry_after
+from pages.general_functions import find_mapping_terms
+from typing import Tuple, Iterable, AsyncIterable, List, Dict, Any, Optional, Union
 
+client_kwargs = {'api_key': conf.OPENAI_API_KEY}
 if conf.OPENAI_API_BASE:
-    client = OpenAI(api_key=conf.OPENAI_API_KEY, base_url=conf.OPENAI_API_BASE)
-    async_client = AsyncOpenAI(api_key=conf.OPENAI_API_KEY, base_url=conf.OPENAI_API_BASE)
-else:
-    client = OpenAI(api_key=conf.OPENAI_API_KEY)
-    async_client = AsyncOpenAI(api_key=conf.OPENAI_API_KEY)
+    client_kwargs['base_url'] = conf.OPENAI_API_BASE
+
+# keep-alive connection pool shared by every request of a client
+http_limits = httpx.Limits(
+    max_connections=conf.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=conf.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=conf.HTTP_KEEPALIVE_EXPIRY,
+)
+
+http_client = httpx.Client(limits=http_limits)
+atexit.register(http_client.close)
+client = OpenAI(**client_kwargs, http_client=http_client)
+
+# async connections belong to the event loop that opened them, and the batch
+# runs one event loop per file and thread, so each loop gets its own client,
+# closed by close_async_client (or run_async) before the loop finishes
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_client() -> AsyncOpenAI:
+    """
+    Get the async client of the running event loop, creating it on first use.
+    :return: AsyncOpenAI client whose connection pool is reused within the loop
+    """
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None:
+        async_client = AsyncOpenAI(**client_kwargs, http_client=httpx.AsyncClient(limits=http_limits))
+        _async_clients[loop] = async_client
+    return async_client
+
+
+async def close_async_client() -> None:
+    """
+    Close the async client of the running event loop, if it opened one.
+    Await it before the loop finishes, so its connection pool doesn't outlive the loop.
+    """
+    async_client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if async_client is not None:
+        await async_client.close()
+
+
+def run_async(coro):
+    """
+    asyncio.run() for coroutines that call the API, closing the loop's async client at the end.
+    :param coro: Coroutine to run in a new event loop
+    :return: The coroutine's result
+    """
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_async_client()
+
+    return asyncio.run(main())
+
+# translation wrapped by the model in a markdown code block
+CODE_BLOCK_RE = re.compile(r"```(?:\w*\n)?(.*?)```", re.DOTALL)
+
+@functools.lru_cache(maxsize=16)
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Tokenizer shared by every chat using the same encoding."""
+    return tiktoken.get_encoding(encoding_name)
+
+
+IMAGE_MIME_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.bmp': 'image/bmp',
+    '.webp': 'image/webp',
+}
+IMAGE_EXTENSIONS = frozenset(IMAGE_MIME_TYPES)
+
+_ENCODE_CHUNK_SIZE = 57 * 1024
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_base64_image(image_path: str, mtime_ns: int, size: int) -> str:
+    """
+    Base64 of an image file, memoized so the same reference images are encoded once
+    per process; mtime and size are part of the key so an edited file is re-read.
+    The file is encoded chunk by chunk, so the raw image is never held whole next to its encoding.
+    """
+    # sized for the whole encoding up front, so the buffer never has to grow
+    encoded = bytearray((size + 2) // 3 * 4)
+    pos = 0
+    with open(image_path, "rb") as image_file:
+        # chunks are a multiple of 3 bytes, so only the last one can carry padding
+        while chunk := image_file.read(_ENCODE_CHUNK_SIZE):
+            piece = binascii.b2a_base64(chunk, newline=False)
+            encoded[pos:pos + len(piece)] = piece
+            pos += len(piece)
+    return encoded[:pos].decode('ascii')
+
+# errors worth another attempt: rate limits, dropped connections, timeouts (a subclass of
+# APIConnectionError) and 5xx; anything else (bad request, auth, context length) fails the same way again
+TRANSIENT_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
 
 rate_control = RateController(
     limit=conf.N_LIMIT,
     period_sec=conf.PERIOD_SEC,
     backoff_max_retry=conf.BACKOFF_MAX_RETRY,
-    backoff_on_errors=(
-        Exception,  # Using general exception instead of specific OpenAI error types
-    )
+    backoff_on_errors=TRANSIENT_ERRORS
 )
 
 
@@ -38,7 +140,7 @@ def chat_completion_create(*args, **kwargs):
 
 @rate_control.apply(asynchronous=True)
 async def chat_completion_acreate(*args, **kwargs):
-    return await async_client.chat.completions.create(*args, **kwargs)
+    return await get_async_client().chat.completions.create(*args, **kwargs)
 
 
 class OpenaiAPIChat:
@@ -53,7 +155,8 @@ class OpenaiAPIChat:
             model_name: str = conf.DEFAULT_MODEL_NAME,
             system_prompt: str = conf.DEFAULT_SYS_PROMPT,
             max_retry: int = 10,
-            image_path: Optional[str] = None
+            image_path: Optional[str] = None,
+            record_history: bool = True
     ):
         """
          Initialize the chat instance.
@@ -61,12 +164,16 @@ class OpenaiAPIChat:
         :param system_prompt: The system prompt to be used.
         :param max_retry: The maximum number of retry attempts for API calls.
         :param image_path: Optional path to a folder containing images for translation enhancement.
+        :param record_history: Whether to keep each turn in chat_log; one-shot chats can skip it.
         """
         self.model_name = model_name
         self.chat_log = []
         self.sys_prompt = system_prompt
-        self.encoding = tiktoken.get_encoding(conf.ENC_MAP.get(model_name, 'cl100k_base'))
+        self.system_msg = {'role': 'system', 'content': system_prompt}
+        self.encoding_name = conf.ENC_MAP.get(model_name, 'cl100k_base')
+        self.encoding = _get_encoding(self.encoding_name)
         self.image_path = image_path  # Add image_path attribute
+        self.record_history = record_history
 
         self.max_retry = max_retry
         self.retry_cnt = 0
@@ -76,20 +183,16 @@ class OpenaiAPIChat:
         
         :return: List of file paths to images
         """
-        if not self.image_path or not os.path.exists(self.image_path) or not os.path.isdir(self.image_path):
+        if not self.image_path or not os.path.isdir(self.image_path):
             return []
         
-        image_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']
-        image_files = []
-        
-        for filename in os.listdir(self.image_path):
-            if any(filename.lower().endswith(ext) for ext in image_extensions):
-                file_path = os.path.join(self.image_path, filename)
-                if os.path.isfile(file_path):
-                    image_files.append(file_path)
-
-        print(f"Found {len(image_files)} image(s) in {self.image_path}")
-        print(f"Image files: {image_files}")
+        with os.scandir(self.image_path) as entries:
+            image_files = [
+                entry.path for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS and entry.is_file()
+            ]
+
+        logging.debug("Found %d image(s) in %s", len(image_files), self.image_path)
         
         return image_files
     
@@ -99,8 +202,8 @@ class OpenaiAPIChat:
         :param image_path: Path to the image file
         :return: Base64 encoded image string
         """
-        with open(image_path, "rb") as image_file:
-            return base64.b64encode(image_file.read()).decode('utf-8')
+        st = os.stat(image_path)
+        return _cached_base64_image(image_path, st.st_mtime_ns, st.st_size)
     
     def _create_message_with_images(self, user_prompt: str) -> List[Dict[str, Any]]:
         """Create message with images for the API call.
@@ -115,31 +218,26 @@ class OpenaiAPIChat:
             return [{'role': 'user', 'content': user_prompt}]
 
         # Embed images as markdown in the message content
-        import mimetypes
-        content_str = user_prompt + "\n\n"
+        # Collect the pieces and join once so the base64 payloads are copied a single time
+        parts = [user_prompt, "\n\n"]
         for image_path in image_files:
             try:
                 base64_image = self._encode_image(image_path)
-                mime_type, _ = mimetypes.guess_type(image_path)
-                if not mime_type:
-                    mime_type = 'application/octet-stream'
+                mime_type = IMAGE_MIME_TYPES.get(os.path.splitext(image_path)[1].lower(), 'application/octet-stream')
                 filename = os.path.basename(image_path)
                 # Use markdown image syntax with base64 data URI
-                content_str += f"![{filename}](data:{mime_type};base64,{base64_image})\n"
-                print(f"Embedded image in markdown: {filename}")
+                parts.append(f"![{filename}](data:{mime_type};base64,")
+                parts.append(base64_image)
+                parts.append(")\n")
+                logging.debug("Embedded image in markdown: %s", filename)
             except Exception as e:
                 print(f"Failed to encode image {image_path}: {e}")
-        return [{'role': 'user', 'content': content_str}]
+        return [{'role': 'user', 'content': ''.join(parts)}]
 
     def _make_msg(self, user_prompt, to_continue=False):
         """Create message for API call, including images if available."""
-        msg = [
-            {
-                'role': 'system',
-                'content': self.sys_prompt
-            },
-            *self.chat_log
-        ]
+        # a new list per call, since translate_many sends concurrent requests through one chat
+        msg = [self.system_msg, *self.chat_log]
         
         if not to_continue:
             # If we have images available, create a message with images
@@ -183,13 +281,21 @@ class OpenaiAPIChat:
                 finish_reason = response.choices[0].finish_reason
                 
                 # For chat history simplicity, store only text even if images were used
-                self.chat_log += OpenaiAPIChat.round_format(user_prompt, full_content)
+                if self.record_history:
+                    self.chat_log += OpenaiAPIChat.round_format(user_prompt, full_content)
                 return full_content, finish_reason
-            except Exception as error:
+            except TRANSIENT_ERRORS as error:
                 retry_cnt += 1
                 print(error, f'retry: {retry_cnt} / {self.max_retry}')
-            print('max retry reached')
-            return '', ''
+                if retry_cnt < self.max_retry:
+                    time.sleep(max(backoff_delay(retry_cnt), retry_after(error)))
+            except Exception as error:
+                # permanent errors fail the same way again, and RetryExhaustedError means
+                # the rate controller has already spent its retries on a transient one
+                print(error)
+                return '', ''
+        print('max retry reached')
+        return '', ''
 
     async def get_aresponse(
             self,
@@ -217,14 +323,22 @@ class OpenaiAPIChat:
                 finish_reason = response.choices[0].finish_reason
                 
                 # For chat history simplicity, store only text even if images were used
-                self.chat_log += OpenaiAPIChat.round_format(user_prompt, full_content)
+                if self.record_history:
+                    self.chat_log += OpenaiAPIChat.round_format(user_prompt, full_content)
                 return full_content, finish_reason
 
-            except Exception as error:
+            except TRANSIENT_ERRORS as error:
                 retry_cnt += 1
                 print(error, f'retry: {retry_cnt} / {self.max_retry}')
-            print('max retry reached')
-            return '', ''
+                if retry_cnt < self.max_retry:
+                    await asyncio.sleep(max(backoff_delay(retry_cnt), retry_after(error)))
+            except Exception as error:
+                # permanent errors fail the same way again, and RetryExhaustedError means
+                # the rate controller has already spent its retries on a transient one
+                print(error)
+                return '', ''
+        print('max retry reached')
+        return '', ''
 
     def get_stream_response(
             self,
@@ -246,18 +360,23 @@ class OpenaiAPIChat:
             **extra_kwargs
         )
         role = None
-        full_content = ''
-        for chunk in response:
-            delta = chunk.choices[0].delta
-            role = getattr(delta, 'role', role)
-            content = getattr(delta, 'content', '') or ''
-            full_content += content
-            finish_reason = chunk.choices[0].finish_reason
-            yield content, finish_reason
+        content_parts = []
+        try:
+            for chunk in response:
+                delta = chunk.choices[0].delta
+                role = getattr(delta, 'role', role)
+                content = getattr(delta, 'content', '') or ''
+                content_parts.append(content)
+                finish_reason = chunk.choices[0].finish_reason
+                yield content, finish_reason
+        finally:
+            # hand the connection back to the pool even if the caller stops early
+            response.close()
         
         # For chat history simplicity, store only text even if images were used
-        self.chat_log.append({'role': 'user', 'content': user_prompt})
-        self.chat_log.append({'role': role or 'assistant', 'content': full_content})
+        if self.record_history:
+            self.chat_log.append({'role': 'user', 'content': user_prompt})
+            self.chat_log.append({'role': role or 'assistant', 'content': ''.join(content_parts)})
 
     async def get_stream_aresponse(
             self,
@@ -279,18 +398,23 @@ class OpenaiAPIChat:
             **extra_kwargs
         )
         role = None
-        full_content = ''
-        async for chunk in response:
-            delta = chunk.choices[0].delta
-            role = getattr(delta, 'role', role)
-            content = getattr(delta, 'content', '') or ''
-            full_content += content
-            finish_reason = chunk.choices[0].finish_reason
-            yield content, finish_reason
+        content_parts = []
+        try:
+            async for chunk in response:
+                delta = chunk.choices[0].delta
+                role = getattr(delta, 'role', role)
+                content = getattr(delta, 'content', '') or ''
+                content_parts.append(content)
+                finish_reason = chunk.choices[0].finish_reason
+                yield content, finish_reason
+        finally:
+            # hand the connection back to the pool even if the caller stops early
+            await response.close()
         
         # For chat history simplicity, store only text even if images were used
-        self.chat_log.append({'role': 'user', 'content': user_prompt})
-        self.chat_log.append({'role': role or 'assistant', 'content': full_content})
+        if self.record_history:
+            self.chat_log.append({'role': 'user', 'content': user_prompt})
+            self.chat_log.append({'role': role or 'assistant', 'content': ''.join(content_parts)})
 
     def n_tokens(self, text):
         """
@@ -300,6 +424,15 @@ class OpenaiAPIChat:
         """
         return len(self.encoding.encode(text))
 
+    def n_tokens_batch(self, texts):
+        """
+        Calculate the number of tokens of many texts at once. tiktoken encodes the
+        batch on its own threads without holding the GIL.
+        :param texts: List of texts to calculate token count.
+        :return: List of token counts, in the order of the texts
+        """
+        return [len(tokens) for tokens in self.encoding.encode_batch(texts)]
+
     @staticmethod
     def round_format(user, assistant):
         return [
@@ -308,76 +441,87 @@ class OpenaiAPIChat:
         ]
 
 
+@functools.lru_cache(maxsize=64)
+def _translation_sys_prompt(source_lang, target_lang, software_type, source_type) -> str:
+    """
+    Translation system prompt, built once per language pair, software type and source type.
+    """
+    return translate_sys_prompt(source_lang, target_lang, software_type, source_type)
+
+
+def _translation_chat(source_lang, target_lang, software_type, source_type, image_path, model_name) -> OpenaiAPIChat:
+    """
+    Create a single-turn chat with the translation system prompt.
+    """
+    # Get the model name from config if not specified
+    if not model_name and hasattr(conf, 'TRANSLATE_MODEL'):
+        model_name = translate_config.TRANSLATE_MODEL
+    return OpenaiAPIChat(
+        model_name=model_name or conf.DEFAULT_MODEL_NAME,
+        system_prompt=_translation_sys_prompt(source_lang, target_lang, software_type, source_type),
+        image_path=image_path,
+        record_history=False  # single turn, history would only be resent with the next entry
+    )
+
+
 async def translate_text_entry(
-        text: str, 
+        text: Union[str, dict], 
         source_lang: str, 
         target_lang: str, 
         mapping_table: dict, 
         software_type: str, 
+        source_type: str,
         image_path: Optional[str] = None,
         model_name: str = None,
         is_batch: bool = False,
-        preserve_newlines: bool = True
+        preserve_newlines: bool = True,
+        chat: Optional[OpenaiAPIChat] = None
     ) -> str:
     """
     Translate a single text entry or a batch of text entries using the translation model.
     
-    :param text: Text to translate or JSON string for batch translation
+    :param text: Text to translate, or for batch translation a JSON string or a dict of the entries
     :param source_lang: Source language
     :param target_lang: Target language
     :param mapping_table: Dictionary with specific name translations
     :param software_type: Type of software being translated
+    :param source_type: Type of source file (e.g., 'UI', 'Help', etc.)
     :param image_path: Optional path to images for translation enhancement
     :param model_name: Optional model name override
     :param is_batch: Whether the input is a batch of text entries in JSON format
     :param preserve_newlines: Whether to explicitly preserve newlines in the translation
+    :param chat: Optional chat to reuse; it must not record history
     :return: Translated text or JSON string for batch translation
     """
     if not text or str(text).strip() == '':
         return ''
-    
-    # Get the model name from config if not specified
-    if not model_name and hasattr(conf, 'TRANSLATE_MODEL'):
-        from config import translate_config
-        model_name = translate_config.TRANSLATE_MODEL
+
+    # A batch given as a dict is serialized once here, instead of the caller dumping it first
+    if is_batch and isinstance(text, dict):
+        text = json.dumps(text, ensure_ascii=False)
     
     # Initialize the chat with appropriate system prompt
-    from prompts.translate_prompts import translate_sys_prompt, translate_prompt
-    chat = OpenaiAPIChat(
-        model_name=model_name or conf.DEFAULT_MODEL_NAME,
-        system_prompt=translate_sys_prompt(source_lang, target_lang, software_type),
-        image_path=image_path
-    )
+    if chat is None:
+        chat = _translation_chat(source_lang, target_lang, software_type, source_type, image_path, model_name)
     
-    # Check if any specific names apply to this text
-    relevant_specific_names = {}
-    if mapping_table:
-        if is_batch:
-            # For batch translation, check all text entries
-            all_text = text  # text is already the JSON string
-            for source_term, target_term in mapping_table.items():
-                if source_term in all_text:
-                    relevant_specific_names[source_term] = target_term
-        else:
-            # For single text translation
-            for source_term, target_term in mapping_table.items():
-                if source_term in text:
-                    relevant_specific_names[source_term] = target_term
-
-    response = ''
+    # Check if any specific names apply to this text (for batches, text is the JSON string of all entries)
+    relevant_specific_names = find_mapping_terms(mapping_table, text)
+
     # try:
     prompt = translate_prompt(
-        text,
         source_lang,
         target_lang,
-        software_type,
-        relevant_specific_names,
+        text,
+        refer_data_list=[],
+        specific_names=relevant_specific_names,
     )
 
     
     # Get translation
+    response_parts = []
     async for chunk, stop_reason in chat.get_stream_aresponse(prompt, temperature=0.01):
-        response += chunk
+        response_parts.append(chunk)
+    response = ''.join(response_parts)
         
     # For batch translations (JSON), we return the raw response to be parsed by the caller
     if is_batch:
@@ -387,7 +531,7 @@ async def translate_text_entry(
     response = response.strip('"\'')
     if "```" in response:
         # If the model wraps the translation in code blocks, extract just the translation
-        match = re.search(r"```(?:\w*\n)?(.*?)```", response, re.DOTALL)
+        match = CODE_BLOCK_RE.search(response)
         if match:
             response = match.group(1).strip()
     # except Exception as e:
@@ -395,3 +539,44 @@ async def translate_text_entry(
     #     return f"ERROR: {str(e)[:100]}" 
         
     return response
+
+
+async def translate_many(
+        entries: List[Union[str, dict]],
+        source_lang: str,
+        target_lang: str,
+        mapping_table: dict,
+        software_type: str,
+        source_type: str,
+        concurrency: int = 8,
+        image_path: Optional[str] = None,
+        model_name: str = None,
+        **kwargs
+    ) -> List[str]:
+    """
+    Translate several entries concurrently, at most `concurrency` in flight at once.
+    The calls share one chat and still pass through the module's rate control.
+    
+    :param entries: Texts (or batches) to translate
+    :param source_lang: Source language
+    :param target_lang: Target language
+    :param mapping_table: Dictionary with specific name translations
+    :param software_type: Type of software being translated
+    :param source_type: Type of source file (e.g., 'UI', 'Help', etc.)
+    :param concurrency: Maximum number of translations awaiting the API at once
+    :param image_path: Optional path to images for translation enhancement
+    :param model_name: Optional model name override
+    :param kwargs: Other translate_text_entry arguments (is_batch, preserve_newlines)
+    :return: Translations in the order of the entries
+    """
+    chat = _translation_chat(source_lang, target_lang, software_type, source_type, image_path, model_name)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def translate_one(entry):
+        async with semaphore:
+            return await translate_text_entry(
+                entry, source_lang, target_lang, mapping_table, software_type, source_type,
+                image_path=image_path, model_name=model_name, chat=chat, **kwargs
+            )
+
+    return await asyncio.gather(*(translate_one(entry) for entry in entries))
@@ -16,6 +16,12 @@ ENC_MAP = {
     'davinci': 'p50k_base'
 }
 
+# >>> http connection pool >>>
+HTTP_MAX_CONNECTIONS = 32  # Max open connections per client
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 16  # Idle connections kept warm for reuse
+HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection stays open (covers the rate-control wait between calls)
+# <<< http connection pool <<<
+
 # >>> api rate control >>>
 N_LIMIT = 1
 PERIOD_SEC = 6.0  # Increased from 3.5 to reduce streaming errors
@@ -40,12 +40,15 @@ RESTRUCT_MODEL = 'gpt-4o'
 TEMPERATURE = 0.0
 SEED = 42
 
+TRANSLATION_CACHE_PATH = r""  # SQLite file caching reviewed translations across files and runs (empty = disabled)
+
 CHECK_VERIFICATION = True  # Set to True to run verification after translation
 CHECK_GROUND_TRUTH = True  # Set to True to check the ground truth
 GROUND_TRUTH_EXCEL_PATH = r"E:\Debby\9_Scripts\TranslateHTML\Translate_HTML_XML_v6\ground_truth.xlsx"  # Path to the ground truth Excel file
 
 # ========= Information for [Run Batch] (Batch Files)==========
 BATCH_EXCEL_PATH = r""  # Default Excel file for batch processing
+BATCH_MAX_WORKERS = 1  # Number of (file, target language) jobs translated concurrently per batch row (1 = one at a time)
 # ========= Information for [Run Batch] (Batch Files)==========
 
 # ========= Information for [Run Program] (Single File)==========
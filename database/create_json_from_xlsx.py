@@ -8,6 +8,12 @@ import json
 import os
 from pathlib import Path
 
+# orjson writes the same indented JSON several times faster; fall back to json when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 def create_json_from_xlsx(
     target_language,
     excel_path,
@@ -39,29 +45,33 @@ def create_json_from_xlsx(
             print(f"Available columns: {columns}")
             return False
         
-        # Extract ENU and CHT columns
-        enu_cht_data = {}
-        for i, row in enumerate(df.itertuples(), 1):
-            enu_value = getattr(row, 'ENU', '')
-            cht_value = getattr(row, target_language, '')
-            
-            # Skip rows where either value is missing
-            if pd.isna(enu_value) or pd.isna(cht_value):
-                continue
-                
-            # Convert to string to ensure JSON serialization
-            enu_value = str(enu_value).strip()
-            cht_value = str(cht_value).strip()
-            
-            # Skip empty values
-            if not enu_value or not cht_value:
-                continue
-                
-            enu_cht_data[i] = (enu_value, cht_value)
+        # Extract ENU and CHT columns, column-wise instead of row by row.
+        # Keys stay the 1-based row number (read_excel gives a 0-based RangeIndex),
+        # so rows skipped below leave gaps as before
+        pairs = df[['ENU', target_language]]
+        
+        # Skip rows where either value is missing
+        pairs = pairs[pairs.notna().all(axis=1)]
+        
+        # Convert to string to ensure JSON serialization
+        enu_values = pairs['ENU'].astype(str).str.strip()
+        cht_values = pairs[target_language].astype(str).str.strip()
+        
+        # Skip empty values
+        keep = (enu_values != '') & (cht_values != '')
+        enu_cht_data = dict(zip(
+            (enu_values.index[keep.to_numpy()] + 1).tolist(),
+            zip(enu_values[keep].tolist(), cht_values[keep].tolist())
+        ))
         
         # Save to JSON file
-        with open(output_json_path, 'w', encoding='utf-8') as f:
-            json.dump(enu_cht_data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            Path(output_json_path).write_bytes(
+                orjson.dumps(enu_cht_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
+        else:
+            with open(output_json_path, 'w', encoding='utf-8') as f:
+                json.dump(enu_cht_data, f, ensure_ascii=False, indent=2)
             
         print(f"Successfully created JSON file with {len(enu_cht_data)} entries: {output_json_path}")
         return True
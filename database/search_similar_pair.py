@@ -15,6 +15,12 @@ import string
 import sys
 from sklearn.feature_extraction.text import TfidfVectorizer
 
+# orjson parses the database several times faster; fall back to json when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Download necessary NLTK resources if not already downloaded
 try:
     nltk.data.find('corpora/stopwords')
@@ -85,8 +91,12 @@ class SimilarPairSearcher:
         if not os.path.exists(self.json_path):
             raise FileNotFoundError(f"JSON file not found at {self.json_path}")
             
-        with open(self.json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(self.json_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
         # Convert from dictionary of lists to dictionary of tuples if needed
         return {int(k): (v[0], v[1]) if isinstance(v, list) else v for k, v in data.items()}
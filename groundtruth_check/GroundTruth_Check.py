@@ -287,7 +287,7 @@ async def compare_with_ground_truth(
     return
 
 
-def main(input_file_path=None, output_file_path=None, ground_truth_result=None, specific_names_xlsx_path=None, software_type=None, source_lang=None, target_lang=None, ground_truth_path=None):
+def main(input_file_path=None, output_file_path=None, ground_truth_result=None, specific_names_xlsx_path=None, software_type=None, source_lang=None, target_lang=None, ground_truth_path=None, check_ground_truth=None):
     """
     Command-line entry point for ground truth verification functionality.
     This function is designed to be called by batch_processor.py.
@@ -299,7 +299,9 @@ def main(input_file_path=None, output_file_path=None, ground_truth_result=None,
     :param software_type: Type of software being translated
     :param source_lang: Source language code
     :param target_lang: Target language code
-    :return: None
+    :param ground_truth_path: Path to the ground truth Excel file (defaults to GROUND_TRUTH_EXCEL_PATH)
+    :param check_ground_truth: Whether to run the ground truth check (defaults to CHECK_GROUND_TRUTH)
+    :return: True if the ground truth result file was written, False otherwise
     """
     # Use provided parameters or fallback to config values
     if not input_file_path:
@@ -317,10 +319,12 @@ def main(input_file_path=None, output_file_path=None, ground_truth_result=None,
     if not target_lang:
         target_lang = conf.TARGET_LANGUAGE
     if not ground_truth_path:
-        ground_truth_path = conf.GROUND_TRUTH_EXCEL_PATH
+        ground_truth_path = getattr(conf, 'GROUND_TRUTH_EXCEL_PATH', None)
+    if check_ground_truth is None:
+        check_ground_truth = getattr(conf, 'CHECK_GROUND_TRUTH', False)
         
     # For backward compatibility, use ground_truth_result as compare_file_path
-    if hasattr(conf, 'CHECK_GROUND_TRUTH') and conf.CHECK_GROUND_TRUTH or ground_truth_result:
+    if check_ground_truth or ground_truth_result:
         print("Running in ground truth verification mode...")
         print(f"Source file: {input_file_path}")
         print(f"Translated file: {output_file_path}")
@@ -332,7 +336,7 @@ def main(input_file_path=None, output_file_path=None, ground_truth_result=None,
         print(f"Save Ground Truth Result to: {ground_truth_result}")
         
         # Ensure the ground truth Excel path is defined
-        if not hasattr(conf, 'GROUND_TRUTH_EXCEL_PATH') or not conf.GROUND_TRUTH_EXCEL_PATH:
+        if not ground_truth_path:
             print("Error: GROUND_TRUTH_EXCEL_PATH not defined in config file.")
             return False
             
@@ -361,6 +365,7 @@ def main(input_file_path=None, output_file_path=None, ground_truth_result=None,
         print(f"Ground truth verification completed and saved to {ground_truth_result}")
         # Return True if the operation was successful (file was created)
         return os.path.exists(ground_truth_result)
+    return False
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
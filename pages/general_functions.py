@@ -191,6 +191,85 @@ def get_relevant_specific_names(specific_names, source_text):
     return relevant_specific_names
 
 
+# compiled matchers keyed by id() of the mapping table they were built from
+_term_matchers = {}
+
+
+def _trie_pattern(terms):
+    """
+    Builds a regex that matches any of the terms, shaped as a character trie so each
+    position of the text is tested in O(term length) instead of once per term.
+    Optional branches are greedy, so the longest term starting at a position wins.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = None  # end of term marker
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in node.items() if ch != '']
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if '' in node else group
+
+    return build(trie)
+
+
+def _get_term_matcher(mapping_table):
+    """
+    Returns the compiled matcher of a mapping table, building it on first use.
+    :param mapping_table: Dictionary of source terms to target terms
+    :return: (pattern, shorter terms that are prefixes of each term, term order,
+              shortest term length, set of term first characters)
+    """
+    cached = _term_matchers.get(id(mapping_table))
+    # compare against the current key set, so a table edited in place (even at the same size) is rebuilt
+    if cached is not None and cached[0] is mapping_table and cached[1] == mapping_table.keys():
+        return cached[2]
+
+    terms = [term for term in mapping_table if term]
+    pattern = re.compile('(?=(' + _trie_pattern(terms) + '))', re.DOTALL)
+    # a position only reports its longest term, so remember the shorter terms it contains as a prefix
+    prefixes = {term: [term[:i] for i in range(1, len(term)) if term[:i] in mapping_table] for term in terms}
+    order = {term: i for i, term in enumerate(terms)}
+    min_len = min(map(len, terms), default=0)
+    first_chars = frozenset(term[0] for term in terms)
+
+    matcher = (pattern, prefixes, order, min_len, first_chars)
+    if len(_term_matchers) >= 16:
+        _term_matchers.clear()
+    _term_matchers[id(mapping_table)] = (mapping_table, frozenset(mapping_table), matcher)
+    return matcher
+
+
+def find_mapping_terms(mapping_table, text):
+    """
+    Finds the mapping table entries whose source term occurs in the text.
+    Same result as testing `source_term in text` for every entry, but done in one pass over the text.
+    :param mapping_table: Dictionary of source terms to target terms
+    :param text: Text to search
+    :return: Dictionary of the matching entries, in mapping table order
+    """
+    if not mapping_table or not text:
+        return {}
+    pattern, prefixes, order, min_len, first_chars = _get_term_matcher(mapping_table)
+    # short UI strings, or text sharing no first character with any term, can't contain a term
+    if len(text) < min_len or first_chars.isdisjoint(text):
+        return {}
+    found = set()
+    for match in pattern.finditer(text):
+        term = match.group(1)
+        if term not in found:
+            found.add(term)
+            found.update(prefixes[term])
+    return {term: mapping_table[term] for term in sorted(found, key=order.__getitem__)}
+
+
 def load_specific_names(excel_path, source_lang, target_lang):
     """
     Load specific name translations from an Excel file based on the configured source and target languages.
@@ -230,10 +309,11 @@ def load_specific_names(excel_path, source_lang, target_lang):
             print(f"Available columns: {', '.join(df.columns)}")
             return specific_names
         
-        # Create a dictionary from the dataframe using only the source and target columns
-        for _, row in df.iterrows():
-            source_term = str(row[source_col]).strip()
-            target_term = str(row[target_col]).strip()
+        # Create a dictionary from the dataframe using only the source and target columns,
+        # zipping the two columns instead of building a Series per row
+        for source_value, target_value in zip(df[source_col].tolist(), df[target_col].tolist()):
+            source_term = str(source_value).strip()
+            target_term = str(target_value).strip()
             
             # Skip empty or nan values
             if source_term and target_term and source_term.lower() != 'nan' and target_term.lower() != 'nan':
@@ -319,18 +399,18 @@ def extract_text_from_excel(file_path, is_source_file=True):
         
         if is_source_file:
             # For source file, extract all text
-            for i, row in df.iterrows():
+            for i, *values in df.itertuples(name=None):
                 # Convert row to string, join non-null values
-                row_text = ' | '.join([str(val) for val in row.values if pd.notna(val)])
+                row_text = ' | '.join([str(val) for val in values if pd.notna(val)])
                 if row_text.strip():  # Only include non-empty rows
                     text_groups[str(i+1)] = row_text
         else:
             # For target file, only extract target language text (assumed to be in the second column)
-            for i, row in df.iterrows():
-                # Check if there are at least 2 columns and the second column has a value
-                if len(row) >= 2 and pd.notna(row[1]):
-                    # Only take the second column (target language)
-                    text_groups[str(i+1)] = str(row[1])
+            if len(df.columns) >= 2:
+                for i, value in df.iloc[:, 1].items():
+                    # Only take the second column (target language) when it has a value
+                    if pd.notna(value):
+                        text_groups[str(i+1)] = str(value)
         
         print(f"Extracted {len(text_groups)} text segments from Excel file")
         return text_groups
@@ -2,10 +2,38 @@ import random
 import asyncio
 import threading
 import time
-from queue import Queue
+from collections import deque
 from typing import Type
 
 
+def backoff_delay(retry_cnt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    Exponential backoff with full jitter, for retry loops outside the RateController.
+    :param retry_cnt: Number of attempts that have failed so far (1 for the first retry)
+    :param base: Delay ceiling of the first retry, in seconds
+    :param cap: Upper bound of the delay ceiling, in seconds
+    :return: Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(cap, base * 2 ** (retry_cnt - 1)))
+
+
+def retry_after(e: Exception) -> float:
+    """
+    Read the server's Retry-After header from an API error, if there is one.
+    :param e: The exception raised by the API call
+    :return: Seconds the server asked to wait, or 0
+    """
+    headers = getattr(getattr(e, 'response', None), 'headers', None)
+    try:
+        return max(0.0, float(headers.get('retry-after'))) if headers else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class RetryExhaustedError(Exception):
+    """Raised by RateController when a call still fails after its last retry."""
+
+
 class RateController:
     def __init__(self,
                  limit: int,
@@ -13,12 +41,16 @@ class RateController:
                  backoff_max_retry: int = 10,
                  backoff_init_delay: float = 2,
                  backoff_exp_base: float = 3,
-                 backoff_on_errors: tuple[Type[Exception], ...] = ()
+                 backoff_on_errors: tuple[Type[Exception], ...] = (),
+                 min_rate_ratio: float = 0.1
                  ):
         """
         Wrapper for rate control in a sliding window fashion with asynchronous support.
-        This class enables rate limiting by blocking calls that exceed the defined
-        limit within a specified period.
+        This class enables rate limiting by delaying calls that exceed the defined
+        limit within a specified period: no `period_sec` window ever holds more than `limit` call starts.
+        On top of the window, a token bucket spaces the calls out when the rate is lowered.
+        The rate adapts to the server: a rate limit error (HTTP 429) halves it, and each
+        success raises it again step by step, never above the configured limit.
         EXAMPLE USAGE:
             rate_control = RateController(limit=10, period_sec=30)  # maximum 10 calls within 30 seconds
 
@@ -37,78 +69,121 @@ class RateController:
         :param backoff_max_retry: The maximum number of retries before raising an exception.
         :param backoff_init_delay: The initial delay before the first retry, in seconds.
         :param backoff_exp_base: The base of exponential backoff.
-        :param backoff_on_errors: A tuple of exceptions upon which retries should be attempted.
+        :param backoff_on_errors: A tuple of exceptions upon which retries should be attempted;
+                                  other errors are raised at once. Empty retries every error.
+        :param min_rate_ratio: The lowest rate the adaptation may fall to, as a fraction of the configured rate.
         """
         self.limit = limit
         self.period = period_sec
-        self._sw = Queue(maxsize=limit)
-        self._t_lock = threading.Lock()
-        self._a_lock = asyncio.Lock()
+
+        # sliding window of the last `limit` start times plus a token bucket for the adaptive rate,
+        # guarded by a thread lock so they are shared safely by threads and event loops;
+        # the lock is only held for the bookkeeping, never while waiting
+        self.starts = deque(maxlen=limit)
+        self.max_rate = limit / period_sec
+        self.min_rate = self.max_rate * min_rate_ratio
+        self.rate = self.max_rate
+        self.capacity = float(limit)
+        self.tokens = float(limit)
+        self.last = time.monotonic()
+        self._lock = threading.Lock()
 
         # retry with backoff
         self.backoff_init_delay = backoff_init_delay
-        self.backoff_delay = backoff_init_delay
         self.backoff_max_retry = backoff_max_retry
         self.backoff_exp_base = backoff_exp_base
         self.backoff_on_errors = backoff_on_errors
 
-    def _block_by_rate(self):
-        now = time.time()
-        if self._sw.full():
-            last = self._sw.get()
-            if (lag := (now - last)) < self.period:
-                time.sleep(self.period - lag)
-        self._sw.put(time.time())
-        return
-
-    async def _ablock_by_rate(self):
-        now = time.time()
-        if self._sw.full():
-            last = self._sw.get()
-            if (lag := (now - last)) < self.period:
-                await asyncio.sleep(self.period - lag)
-        self._sw.put(time.time())
-        return
+    def _reserve(self) -> float:
+        """
+        Reserve a start time for a call, honouring both the bucket and the window.
+        :return: Seconds to wait before the call may start
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            # a missing token is borrowed from the future, so queued callers get increasing waits
+            self.tokens -= 1
+            start = now - self.tokens / self.rate if self.tokens < 0 else now
+            if self.starts:
+                # keep start times ordered, so the oldest entry is always the window's edge
+                start = max(start, self.starts[-1])
+            if len(self.starts) == self.limit:
+                # the call `limit` starts back must have left the window first
+                start = max(start, self.starts[0] + self.period)
+            self.starts.append(start)
+            return start - now
+
+    def _on_success(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+    def _on_rate_limited(self):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * 0.5)
+            self.tokens = min(self.tokens, 0.0)
+
+    @staticmethod
+    def _is_rate_limited(e: Exception) -> bool:
+        status = getattr(e, 'status_code', None) or getattr(e, 'code', None)
+        return status == 429 or 'RateLimit' in type(e).__name__ or 'ResourceExhausted' in type(e).__name__
+
+    def _retry_delay(self, e: Exception, num_retry: int, backoff_delay: float) -> tuple[float, float]:
+        """
+        Work out how long to wait after a failed call.
+        :return: (delay before the retry, backoff delay for the next failure)
+        """
+        if self._is_rate_limited(e):
+            self._on_rate_limited()
+        if isinstance(e, self.backoff_on_errors):
+            delay = backoff_delay
+            backoff_delay = min(backoff_delay * (self.backoff_exp_base + random.uniform(-1, 1)), 300)
+        else:
+            delay = self.backoff_init_delay
+        delay = max(delay, retry_after(e))
+        print(f'RateController: Error: {e} | Retry: {num_retry}/{self.backoff_max_retry} '
+              f'| BackoffDelay: {delay}s    [{time.ctime()}]')
+        return delay, backoff_delay
 
     def _run(self, func, *fargs, **fkwargs):
         num_retry = 0
         backoff_delay = self.backoff_init_delay
         while True:
+            if wait := self._reserve():
+                time.sleep(wait)
             try:
-                with self._t_lock:
-                    self._block_by_rate()
-                return func(*fargs, **fkwargs)
-
+                ret = func(*fargs, **fkwargs)
+                self._on_success()
+                return ret
             except Exception as e:
+                if self.backoff_on_errors and not isinstance(e, self.backoff_on_errors):
+                    raise
                 num_retry += 1
                 if num_retry > self.backoff_max_retry:
-                    raise Exception(f'Maximum retry reached: {e}')
-                if e in self.backoff_on_errors:
-                    time.sleep(backoff_delay)
-                    backoff_delay *= (self.backoff_exp_base + random.uniform(-1, 1))
+                    raise RetryExhaustedError(f'Maximum retry reached: {e}') from e
+                delay, backoff_delay = self._retry_delay(e, num_retry, backoff_delay)
+                time.sleep(delay)
 
     async def _arun(self, func, *fargs, **fkwargs):
         num_retry = 0
+        backoff_delay = self.backoff_init_delay
         while True:
+            if wait := self._reserve():
+                await asyncio.sleep(wait)
             try:
-                async with self._a_lock:
-                    await self._ablock_by_rate()
                 ret = await func(*fargs, **fkwargs)
-                self.backoff_delay = self.backoff_init_delay
+                self._on_success()
                 return ret
             except Exception as e:
+                if self.backoff_on_errors and not isinstance(e, self.backoff_on_errors):
+                    raise
                 num_retry += 1
                 if num_retry > self.backoff_max_retry:
-                    raise Exception(f'Maximum retry reached: {e}')
-                if any(isinstance(e, e_type) for e_type in self.backoff_on_errors):
-                    delay = self.backoff_delay
-                    self.backoff_delay *= (self.backoff_exp_base + random.uniform(-1, 1))
-                    self.backoff_delay = min(self.backoff_delay, 300)
-                else:
-                    delay = self.backoff_init_delay
-                await asyncio.sleep(delay)  # block the event loop or thread
-                print(f'RateController: Error: {e} | Retry: {num_retry}/{self.backoff_max_retry} '
-                      f'| BackoffDelay: {delay}s    [{time.ctime()}]')
+                    raise RetryExhaustedError(f'Maximum retry reached: {e}') from e
+                delay, backoff_delay = self._retry_delay(e, num_retry, backoff_delay)
+                await asyncio.sleep(delay)
 
     def apply(self, asynchronous: bool = False):
         """
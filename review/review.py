@@ -11,7 +11,7 @@ import os
 import asyncio
 import re
 import pandas as pd
-from chat.openai_api_chat import OpenaiAPIChat
+from chat.openai_api_chat import OpenaiAPIChat, close_async_client
 from chat.gemini_api_chat import GeminiAPIChat
 from prompts.review_prompts import *
 from prompts.improve_prompts import *
@@ -638,7 +638,8 @@ def compare_result(
         )
     )
     
-    # 最後關閉事件循環
+    # 最後關閉事件循環 (先關閉此循環開啟的 async client 連線池)
+    loop.run_until_complete(close_async_client())
     loop.close()
     
     # 處理結果
@@ -4,21 +4,26 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardi
 
 from bs4 import BeautifulSoup
 from collections import OrderedDict
-from chat.openai_api_chat import OpenaiAPIChat
+from chat.openai_api_chat import OpenaiAPIChat, run_async
 from database.search_similar_pair import main as search_similar_pair_main
 from pages.general_functions import get_relevant_specific_names, as_json_obj, InlineGroup, get_text_group_inline, load_specific_names, detect_file_encoding
 from prompts.translate_prompts import *
 from prompts.restruct_prompts import *
 from translate.restruct import *
+from translate import translation_cache
 from review.review import *
 import asyncio
 import re
 import math
 import pandas as pd
 import openpyxl
-from openpyxl.styles import Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font
 from config import translate_config as conf
 
+WRAP_ALIGNMENT = Alignment(wrap_text=True)
+BOLD_FONT = Font(bold=True)
+
 def debug_process(
         source_text_index: str,
         source_text: str,
@@ -47,30 +52,21 @@ def debug_process(
         if file_exists:
             wb = openpyxl.load_workbook(debug_file)
             ws = wb.active
-            # Get next empty row
-            next_row = ws.max_row + 1
         else:
             wb = openpyxl.Workbook()
             ws = wb.active
             # Add headers if creating a new file
-            headers = ["Source Index", "Source Text", "Specific Names", "Similar Pairs", "Prompt", "Response", "Output"]
-            for col, header in enumerate(headers, 1):
-                ws.cell(row=1, column=col, value=header)
-            next_row = 2  # Start data from row 2
-        
-        # Add data to the next row
-        ws.cell(row=next_row, column=1, value=str(source_text_index))
-        ws.cell(row=next_row, column=2, value=str(source_text))
-        ws.cell(row=next_row, column=3, value=str(relevant_specific_names))
-        ws.cell(row=next_row, column=4, value=str(relevant_pair_database))
-        ws.cell(row=next_row, column=5, value=str(prompt))
-        ws.cell(row=next_row, column=6, value=str(response))
-        ws.cell(row=next_row, column=7, value=str(output))
+            ws.append(["Source Index", "Source Text", "Specific Names", "Similar Pairs", "Prompt", "Response", "Output"])
         
-        # Apply word wrap for better readability in Excel
-        for col in range(1, 8):
-            cell = ws.cell(row=next_row, column=col)
-            cell.alignment = Alignment(wrap_text=True)
+        # Append the data after the last row; ws.append keeps its own row counter
+        # instead of scanning the sheet for max_row. Word wrap is applied for better
+        # readability in Excel.
+        row = []
+        for value in (source_text_index, source_text, relevant_specific_names, relevant_pair_database, prompt, response, output):
+            cell = WriteOnlyCell(ws, value=str(value))
+            cell.alignment = WRAP_ALIGNMENT
+            row.append(cell)
+        ws.append(row)
         
         # Save the workbook
         wb.save(debug_file)
@@ -90,10 +86,11 @@ def segment_groups_map(
     of the model. Also, run each segments currently also speeds up the job.
     :param groups_map: Dictionary of inline groups and their id
     :param max_token: max number of token in each segment
-    :param token_counter: a function that takes a string as input and output number of tokens
+    :param token_counter: a function that takes a list of strings as input and output the number of tokens of each
     :return: A list of segmented inline groups
     """
-    if not (token_all := sum([token_counter(str(g)) for g in groups_map.values()])):
+    token_counts = token_counter([str(g) for g in groups_map.values()])
+    if not (token_all := sum(token_counts)):
         return []
     n_seg = math.ceil(token_all / max_token)
     len_seg = math.ceil(token_all / n_seg)
@@ -101,8 +98,7 @@ def segment_groups_map(
     token_cnt = 0
     cnt = 0
     seg = OrderedDict({})
-    for k, group in groups_map.items():
-        n = token_counter(str(group))
+    for group, n in zip(groups_map.values(), token_counts):
         if n > max_token:
             # raise ValueError(f'Length of single paragraph [{n}] exceed max length [{max_token}].')
             print(f'Single paragraph exceed max length [{n} > {max_token}]. Skip this one!')
@@ -160,6 +156,20 @@ async def translate_groups(
             relevant_pair_database = search_similar_pair_main(translate_dict={source_text_index: source_text}, database_path=database_path, grammar_top_n=5, term_top_n=5)
         print(f"Relevant specific names for translation: {relevant_pair_database}")
         
+        # Reuse the reviewed translation of an identical request from an earlier file or run
+        cache_path = getattr(conf, 'TRANSLATION_CACHE_PATH', None)
+        cache_key = None
+        if cache_path:
+            cache_key = translation_cache.make_key(
+                conf.TRANSLATE_MODEL, conf.COMPARISON_MODEL, source_lang, target_lang, software_type, source_type,
+                source_text, relevant_specific_names, relevant_pair_database, image_path,
+            )
+            cached_text = translation_cache.lookup(cache_path, cache_key)
+            if cached_text is not None:
+                print(f"Translation cache hit for group {source_text_index}")
+                groups_out[source_text_index] = cached_text
+                continue
+        
         # Initialize the chat with image_path if provided
         chat = OpenaiAPIChat(
             model_name=conf.TRANSLATE_MODEL,
@@ -211,6 +221,8 @@ async def translate_groups(
                                             review_path=review_report_path)
 
         groups_out[source_text_index] = translated_text
+        if cache_key and review_pass_flag:
+            translation_cache.store(cache_path, cache_key, translated_text)
 
         debug_process(source_text_index, source_text, relevant_specific_names, relevant_pair_database, p, response, list(as_json_obj(response).values())[-1])
 
@@ -273,7 +285,7 @@ async def translation_pipeline(
     groups_map_segments = segment_groups_map(
         groups_map,
         int(conf.N_INPUT_TOKEN),
-        OpenaiAPIChat(conf.TRANSLATE_MODEL).n_tokens
+        OpenaiAPIChat(conf.TRANSLATE_MODEL).n_tokens_batch
     )
     tasks = [translate_groups(seg, source_lang, target_lang, mapping_table, software_type, source_type, image_path, database_path, review_report_path) for seg in groups_map_segments]
     results = await asyncio.gather(*tasks)
@@ -421,7 +433,7 @@ async def translate_xlsx(
             groups_map_segments = segment_groups_map(
                 groups_map,
                 int(conf.N_INPUT_TOKEN),
-                OpenaiAPIChat(conf.TRANSLATE_MODEL).n_tokens
+                OpenaiAPIChat(conf.TRANSLATE_MODEL).n_tokens_batch
             )
             
             print(f"Split the text into {len(groups_map_segments)} segments for translation")
@@ -484,7 +496,7 @@ async def translate_xlsx(
         for col_idx, column in enumerate(output_df.columns):
             # Bold header
             cell = ws.cell(row=1, column=col_idx+1)
-            cell.font = openpyxl.styles.Font(bold=True)
+            cell.font = BOLD_FONT
             
             # Auto-adjust column width based on content length
             max_length = len(str(column))
@@ -632,7 +644,7 @@ def process_single_file(p_in, p_out, source_lang, target_lang, specific_names_xl
             print(f"Single language translation to: {target_lang}")
             
         # For XLSX files, we run special translation procedure
-        result = asyncio.run(translate_xlsx(p_in, p_out, source_lang, target_languages, mapping_table, software_type, source_type, image_path, database_path, review_report_path))
+        result = run_async(translate_xlsx(p_in, p_out, source_lang, target_languages, mapping_table, software_type, source_type, image_path, database_path, review_report_path))
         
         # Check the result
         if result["success"]:
@@ -644,7 +656,7 @@ def process_single_file(p_in, p_out, source_lang, target_lang, specific_names_xl
     # Handle HTML files    
     if file_type == 'html':
         bs = BeautifulSoup(file_content, 'html.parser')
-        ret = asyncio.run(translation_pipeline(bs, source_lang, target_lang, mapping_table, software_type, source_type, image_path, database_path, review_report_path))
+        ret = run_async(translation_pipeline(bs, source_lang, target_lang, mapping_table, software_type, source_type, image_path, database_path, review_report_path))
         
         # Use the same encoding for writing
         with open(p_out, 'w', encoding=used_encoding) as fout:
@@ -654,7 +666,7 @@ def process_single_file(p_in, p_out, source_lang, target_lang, specific_names_xl
     else:
         print('Start to translate XML...')
         bs = BeautifulSoup(file_content, file_type)
-        ret = asyncio.run(translation_pipeline(bs, source_lang, target_lang, mapping_table, software_type, source_type, image_path, database_path, review_report_path))
+        ret = run_async(translation_pipeline(bs, source_lang, target_lang, mapping_table, software_type, source_type, image_path, database_path, review_report_path))
 
         # Use the same encoding for writing
         with open(p_out, 'w', encoding=used_encoding) as fout:
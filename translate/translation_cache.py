@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+import hashlib
+import json
+import sqlite3
+import threading
+
+_local = threading.local()
+
+
+def _get_connection(cache_path: str) -> sqlite3.Connection:
+    """
+    Returns this thread's connection to the cache database, creating the table on first use.
+    SQLite connections can't be shared between threads, so each worker thread opens its own.
+    :param cache_path: Path to the SQLite cache file
+    :return: Open connection
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(cache_path)
+    if conn is None:
+        conn = sqlite3.connect(cache_path, timeout=30)
+        # WAL lets concurrent workers read while another one writes
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+        conn.commit()
+        connections[cache_path] = conn
+    return conn
+
+
+def make_key(*parts) -> str:
+    """
+    Builds a cache key from everything that shapes a translation
+    (model, languages, prompt context, source text).
+    :param parts: JSON serializable values
+    :return: Hex digest identifying the translation
+    """
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def lookup(cache_path: str, key: str):
+    """
+    Looks up a finished translation.
+    :param cache_path: Path to the SQLite cache file
+    :param key: Key from make_key
+    :return: The cached translation, or None on a miss
+    """
+    row = _get_connection(cache_path).execute(
+        'SELECT value FROM translations WHERE key = ?', (key,)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def store(cache_path: str, key: str, value) -> None:
+    """
+    Stores a finished translation.
+    :param cache_path: Path to the SQLite cache file
+    :param key: Key from make_key
+    :param value: JSON serializable translation
+    """
+    conn = _get_connection(cache_path)
+    with conn:
+        conn.execute(
+            'INSERT OR REPLACE INTO translations (key, value) VALUES (?, ?)',
+            (key, json.dumps(value, ensure_ascii=False)),
+        )